@@ -1,25 +1,85 @@
+import hashlib
+import json
 import os
 import pkgutil
+import sys
+import time
+import aiohttp
 import discord
 from discord.ext import commands
 from utils.db import DB
+from utils.notifications import NotificationSender
+from utils.storage import WEBHOOKS
+from utils.webhook_dispatch import WebhookDispatcher
 
 TOKEN = os.getenv("DISCORD_TOKEN")
 CLIENT_ID = os.getenv("CLIENT_ID")
+# Sync even if the command tree hash is unchanged (`python bot.py --force-sync` or FORCE_SYNC=1)
+FORCE_SYNC = "--force-sync" in sys.argv or os.getenv("FORCE_SYNC", "").lower() in ("1", "true", "yes")
+# Sync to this guild only (instant updates while developing) instead of globally
+DEV_GUILD_ID = os.getenv("DEV_GUILD_ID")
+
+def command_tree_hash(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake | None = None) -> str:
+    """Stable hash of the serialized app-command tree, as it would be sent to Discord."""
+    payload = sorted((cmd.to_dict(tree) for cmd in tree.get_commands(guild=guild)),
+                     key=lambda c: (c.get("type", 1), c["name"]))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
 
 class MyBot(commands.Bot):
+    http_session: aiohttp.ClientSession
+    webhook_dispatcher: WebhookDispatcher
+    notifier: NotificationSender
+
     async def setup_hook(self):
+        # One keep-alive HTTP session for webhook posts, shared by all cogs for the bot's lifetime
+        self.http_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+            limit=64, limit_per_host=16, keepalive_timeout=60, ttl_dns_cache=300,
+        ))
+        self.webhook_dispatcher = WebhookDispatcher(self.http_session)
         await DB.init()
+        await DB.warm_caches()
+        await WEBHOOKS.load()
+        # Owner DMs queued in the notifications outbox; the sender waits for on_ready before sending
+        self.notifier = NotificationSender(self)
+        DB.on_character_change(self.notifier.on_character_change)
+        self.notifier.start()
         print("✅ DB initialized")
         # Load every module in cogs/ 
         import cogs
         for _, name, _ in pkgutil.iter_modules(cogs.__path__):
             await self.load_extension(f"cogs.{name}")
-        # Global sync 
-        await self.tree.sync()
-        print("✅ Slash commands synced.")
+        await self.sync_commands()
+
+    async def sync_commands(self):
+        """Sync app commands only when the tree changed since the last sync (or FORCE_SYNC)."""
+        guild = discord.Object(id=int(DEV_GUILD_ID)) if DEV_GUILD_ID else None
+        if guild:
+            self.tree.copy_global_to(guild=guild)
+        scope = f"guild {guild.id}" if guild else "global"
+        meta_key = f"command_tree_hash:{guild.id}" if guild else "command_tree_hash"
+
+        digest = command_tree_hash(self.tree, guild)
+        if not FORCE_SYNC and await DB.get_meta(meta_key) == digest:
+            print(f"✅ Slash commands unchanged ({scope}); skipped sync.")
+            return
+        started = time.perf_counter()
+        await self.tree.sync(guild=guild)
+        await DB.set_meta(meta_key, digest)
+        print(f"✅ Slash commands synced ({scope}) in {time.perf_counter() - started:.2f}s.")
+
+    async def close(self):
+        await super().close()
+        if getattr(self, "notifier", None):
+            await self.notifier.close()
+        if getattr(self, "webhook_dispatcher", None):
+            await self.webhook_dispatcher.close()
+        if getattr(self, "http_session", None):
+            await self.http_session.close()
+        await DB.close()
+        print("✅ DB connections closed")
 
 intents = discord.Intents.default()
+intents.message_content = True  # needed to read proxy prefixes in on_message
 bot = MyBot(command_prefix="!", intents=intents)
 
 @bot.event
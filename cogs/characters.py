@@ -1,11 +1,19 @@
 # cogs/characters.py
-from typing import Optional
+import asyncio
+import datetime
+import os
+from collections import OrderedDict, defaultdict
+from typing import Literal, Optional
 from unicodedata import name
 import discord
-import json, re, traceback
+import re, traceback
 from discord.ext import commands
 from discord import app_commands, ui
+from utils.character_index import CHARACTERS, character_choices
 from utils.db import DB
+from utils.face_claims import FACE_CLAIM_KEY, FACE_CLAIMS
+from utils.models import Character
+from utils.paginator import KeysetPager, clip
 
 def is_reviewer(member: discord.Member, settings_row) -> bool:
     if member.guild_permissions.manage_guild:
@@ -15,41 +23,67 @@ def is_reviewer(member: discord.Member, settings_row) -> bool:
         return any(r.id == rid for r in member.roles)
     return False
 
-def char_embed(row: dict) -> discord.Embed:
-    row = dict(row)  # Ensure row is always a dict
-    e = discord.Embed(title=f"Character #{row['id']}: {row['name']}", color=0x5B6770)
-    e.add_field(name="Owner", value=f"<@{row['owner_id']}>", inline=True)
-    e.add_field(name="Status", value=row["status"], inline=True)
+# Rendered embeds by (character id, version); a character's version changes on every update
+EMBED_CACHE_SIZE = 512
+_embed_cache: "OrderedDict[tuple[int, int], discord.Embed]" = OrderedDict()
+
+def char_embed(char: Character) -> discord.Embed:
+    """Embed for a character, rendered once per version (callers must not modify it)."""
+    key = (char.id, char.version)
+    e = _embed_cache.get(key)
+    if e is not None:
+        _embed_cache.move_to_end(key)
+        return e
+    e = _render_embed(char)
+    _embed_cache[key] = e
+    if len(_embed_cache) > EMBED_CACHE_SIZE:
+        _embed_cache.popitem(last=False)
+    return e
 
-    if row.get("bio"):
-        e.add_field(name="Bio", value=str(row["bio"])[:1024], inline=False)
+def _render_embed(char: Character) -> discord.Embed:
+    e = discord.Embed(title=f"Character #{char.id}: {char.name}", color=0x5B6770)
+    e.add_field(name="Owner", value=f"<@{char.owner_id}>", inline=True)
+    e.add_field(name="Status", value=char.status, inline=True)
 
-    extra_json = row.get("extra_json")
-    if extra_json:
-        try:
-            extra = json.loads(extra_json)
-            # Render pretty, but keep it short (Discord limits)
-            pretty = []
-            for k, v in extra.items():
-                if not v:
-                    continue
-                label = k.replace("_", " ").title()
-                pretty.append(f"**{label}**: {v}")
-            if pretty:
-                e.add_field(name="Extra", value="\n".join(pretty)[:1024], inline=False)
-        except Exception:
-            pass
-
-    if row.get("decision_reason"):
-        e.add_field(name="Decision Reason", value=str(row["decision_reason"])[:1024], inline=False)
-
-    if row.get("avatar_url"):
-        e.set_thumbnail(url=row["avatar_url"])
+    if char.bio:
+        e.add_field(name="Bio", value=str(char.bio)[:1024], inline=False)
+
+    if char.fields:
+        # Render pretty, but keep it short (Discord limits)
+        pretty = []
+        for k, v in char.fields.items():
+            if not v:
+                continue
+            label = k.replace("_", " ").title()
+            pretty.append(f"**{label}**: {v}")
+        if pretty:
+            e.add_field(name="Extra", value="\n".join(pretty)[:1024], inline=False)
+
+    if char.decision_reason:
+        e.add_field(name="Decision Reason", value=str(char.decision_reason)[:1024], inline=False)
+
+    if char.avatar_url:
+        e.set_thumbnail(url=char.avatar_url)
 
     return e
 
 URL_RE = re.compile(r"^https?://", re.I)
 
+# Startup reconciliation: how many channels are checked at once
+RECONCILE_CONCURRENCY = int(os.getenv("RECONCILE_CONCURRENCY", "4"))
+# channel.history returns at most this many messages per request
+HISTORY_PAGE = 100
+
+# /characters list page size
+CHARACTERS_PAGE_SIZE = 10
+# /apps rows per page and name length per row: 20 rows of ~80 characters stay well inside a message
+APPS_PAGE_MAX = 20
+APPS_NAME_MAX = 40
+
+# /apps_bulk: most applications decided per command, and how often the progress message is refreshed
+BULK_MAX = 500
+BULK_PROGRESS_INTERVAL = 2.0
+
 class ApplyModal(ui.Modal):
     def __init__(self, bot: commands.Bot, guild_id: int, form: list[dict]):
         super().__init__(title="Character Application", timeout=300)
@@ -72,52 +106,51 @@ class ApplyModal(ui.Modal):
             self.add_item(ti)
 
     async def on_submit(self, interaction: discord.Interaction):
-        # Defer first; from now on use interaction.followup.send(...)
-        await interaction.response.defer(ephemeral=True, thinking=True)
-        try:
-            if not interaction.guild:
-                await interaction.followup.send("Use this in a server.", ephemeral=True)
-                return
+        if not interaction.guild:
+            return await interaction.response.send_message("Use this in a server.", ephemeral=True)
 
-            # Collect answers
-            answers = {k: (str(inp.value).strip() if inp.value is not None else "")
-                       for k, inp in self.inputs.items()}
+        # Collect answers
+        answers = {k: (str(inp.value).strip() if inp.value is not None else "")
+                   for k, inp in self.inputs.items()}
 
-            # Required: name
-            name = answers.pop("name", "") or None
-            if not name:
-                await interaction.followup.send("Name is required.", ephemeral=True)
-                return
+        # Required: name
+        name = answers.pop("name", "") or None
+        if not name:
+            return await interaction.response.send_message("Name is required.", ephemeral=True)
 
-            # Everything else goes into extra_json (e.g., Age, Face Claim, Occupation, etc.)
-            extra_json = json.dumps({k: v for k, v in answers.items() if v}, ensure_ascii=False) if any(answers.values()) else None
+        # Everything else is stored as character fields (e.g., Age, Face Claim, Occupation, etc.)
+        extra = {k: v for k, v in answers.items() if v}
 
-            # Create the character (be tolerant of your DB signature)
-            try:
-                # Newer DB signature that accepts extra_json as a named arg
-                char_id = await DB.create_character(
-                    guild_id=interaction.guild_id,       # type: ignore
-                    owner_id=interaction.user.id,
-                    name=name,
-                    extra_json=extra_json,
-                )
-            except TypeError:
-                # Older signature (no extra_json): just store name; extras are ignored
-                char_id = await DB.create_character(
+        # Face claims are unique per guild among pending/approved characters (in-memory lookup)
+        face_claim = extra.get(FACE_CLAIM_KEY)
+        if face_claim and not FACE_CLAIMS.reserve(interaction.guild_id, face_claim):  # type: ignore
+            holder = FACE_CLAIMS.holder(interaction.guild_id, face_claim)  # type: ignore
+            taken = f"character **#{holder}**" if holder else "another application being submitted"
+            return await interaction.response.send_message(
+                f"❌ The face claim **{face_claim}** is already taken by {taken}.", ephemeral=True
+            )
+
+        try:
+            # Defer and insert concurrently; from now on use interaction.followup.send(...)
+            results = await asyncio.gather(
+                interaction.response.defer(ephemeral=True, thinking=True),
+                DB.create_character(
                     guild_id=interaction.guild_id,       # type: ignore
                     owner_id=interaction.user.id,
                     name=name,
-                )
-
-            # Fetch row + build embed
-            row = await DB.get_character(interaction.guild_id, char_id)  # type: ignore
-            # aiosqlite.Row -> dict for our embed helper
-            row_dict = dict(row) if row is not None else {"id": char_id, "name": name, "owner_id": interaction.user.id, "status": "pending"}
-            e = char_embed(row_dict)
-
-            # Where to route the review?
-            settings = await DB.get_settings(interaction.guild_id)  # type: ignore
-            settings = dict(settings) if settings else {}
+                    extra=extra,
+                ),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            row = results[1]
+            char_id = row.id
+            e = char_embed(row)
+
+            # Where to route the review? (settings come from the in-memory cache)
+            settings = await DB.get_settings(interaction.guild_id) or {}  # type: ignore
             review_channel = None
             rc_id = settings.get("review_channel_id")
             if rc_id:
@@ -126,18 +159,18 @@ class ApplyModal(ui.Modal):
             view = ReviewButtons(interaction.guild_id, char_id)  # type: ignore
 
             if review_channel:
-                # Send to the review channel + save mapping so buttons never expire
                 msg = await review_channel.send(embed=e, view=view)
-                try:
-                    await DB.save_review_message(interaction.guild_id, review_channel.id, msg.id, char_id)  # type: ignore
-                except Exception:
-                    # If you haven't added save_review_message yet, this will just no-op
-                    pass
-
-                await interaction.followup.send(
-                    f"✅ Application submitted! Your ID is **{char_id}**. Mods will review it soon.",
-                    ephemeral=True
+                # Save the mapping (so buttons never expire) while acknowledging the applicant
+                saved, _ = await asyncio.gather(
+                    DB.save_review_message(interaction.guild_id, review_channel.id, msg.id, char_id),  # type: ignore
+                    interaction.followup.send(
+                        f"✅ Application submitted! Your ID is **{char_id}**. Mods will review it soon.",
+                        ephemeral=True
+                    ),
+                    return_exceptions=True,
                 )
+                if isinstance(saved, BaseException):
+                    print("[ApplyModalError] save_review_message failed:", repr(saved))
             else:
                 # No review channel configured: show preview back to the applicant
                 await interaction.followup.send(
@@ -148,7 +181,7 @@ class ApplyModal(ui.Modal):
         except Exception as err:
             # Log to console and inform the user
             print("[ApplyModalError]", repr(err))
-            import traceback; print(traceback.format_exc())
+            print(traceback.format_exc())
             try:
                 await interaction.followup.send(
                     "❌ Something went wrong submitting your application. "
@@ -157,30 +190,29 @@ class ApplyModal(ui.Modal):
                 )
             except Exception:
                 pass
+        finally:
+            # Once the row exists the claim is held by the index itself
+            if face_claim:
+                FACE_CLAIMS.release(interaction.guild_id, face_claim)  # type: ignore
 
 
-class ReviewButtons(ui.View):
-    def __init__(self, guild_id: int, char_id: int):
-        super().__init__(timeout=None)
-        self.guild_id = guild_id
-        self.char_id = char_id
+class ApproveButton(ui.DynamicItem[ui.Button], template=r"char:approve:(?P<guild_id>[0-9]+):(?P<char_id>[0-9]+)"):
+    """Persistent Approve button; routed by custom_id, so no per-message view is stored."""
 
-        approve = ui.Button(
+    def __init__(self, guild_id: int, char_id: int):
+        super().__init__(ui.Button(
             label="Approve",
             style=discord.ButtonStyle.success,
             custom_id=f"char:approve:{guild_id}:{char_id}"
-        )
-        reject = ui.Button(
-            label="Reject",
-            style=discord.ButtonStyle.danger,
-            custom_id=f"char:reject:{guild_id}:{char_id}"
-        )
-        approve.callback = self._approve_cb
-        reject.callback = self._reject_cb
-        self.add_item(approve)
-        self.add_item(reject)
+        ))
+        self.guild_id = guild_id
+        self.char_id = char_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Button, match):
+        return cls(int(match["guild_id"]), int(match["char_id"]))
 
-    async def _approve_cb(self, interaction: discord.Interaction):
+    async def callback(self, interaction: discord.Interaction):
         if not interaction.guild:
             return await interaction.response.send_message("Use this in a server.", ephemeral=True)
 
@@ -188,26 +220,36 @@ class ReviewButtons(ui.View):
         if not isinstance(interaction.user, discord.Member) or not is_reviewer(interaction.user, settings):
             return await interaction.response.send_message("You can’t approve this.", ephemeral=True)
 
-        await DB.set_status(self.guild_id, self.char_id, "approved", interaction.user.id, None)
-        row = await DB.get_character(self.guild_id, self.char_id)
+        row, decided = await DB.decide(self.guild_id, self.char_id, "approved", interaction.user.id, None,
+                                       interaction.message.id)  # type: ignore
+        if row is None:
+            return await interaction.response.edit_message(content="This character no longer exists.", embed=None, view=None)
         # Remove buttons from the review message
         await interaction.response.edit_message(embed=char_embed(row), view=None)
-        # Clean up mapping so we don't try to reattach on reboot
-        try:
-            await DB.delete_review_message(self.guild_id, interaction.message.id)  # type: ignore
-        except Exception:
-            pass
-        # Notify
-        try:
-            await interaction.followup.send(f"✅ Approved character **#{self.char_id}**.", ephemeral=True)
-            if row:
-                owner = interaction.guild.get_member(row["owner_id"])
-                if owner:
-                    await owner.send(f"Your character **{row['name']}** (ID {self.char_id}) was approved!")
-        except Exception:
-            pass
-
-    async def _reject_cb(self, interaction: discord.Interaction):
+        if not decided:
+            return await interaction.followup.send(
+                f"Character **#{self.char_id}** was already {row.status} by <@{row.reviewed_by}>.", ephemeral=True
+            )
+        # The owner's DM was queued with the decision; the notification sender delivers it
+        await interaction.followup.send(f"✅ Approved character **#{self.char_id}**.", ephemeral=True)
+
+class RejectButton(ui.DynamicItem[ui.Button], template=r"char:reject:(?P<guild_id>[0-9]+):(?P<char_id>[0-9]+)"):
+    """Persistent Reject button; opens RejectModal."""
+
+    def __init__(self, guild_id: int, char_id: int):
+        super().__init__(ui.Button(
+            label="Reject",
+            style=discord.ButtonStyle.danger,
+            custom_id=f"char:reject:{guild_id}:{char_id}"
+        ))
+        self.guild_id = guild_id
+        self.char_id = char_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Button, match):
+        return cls(int(match["guild_id"]), int(match["char_id"]))
+
+    async def callback(self, interaction: discord.Interaction):
         if not interaction.guild:
             return await interaction.response.send_message("Use this in a server.", ephemeral=True)
 
@@ -218,6 +260,12 @@ class ReviewButtons(ui.View):
         # Show modal to capture reason; pass identifiers along
         await interaction.response.send_modal(RejectModal(self.guild_id, self.char_id, review_message_id=interaction.message.id))  # type: ignore
 
+class ReviewButtons(ui.View):
+    def __init__(self, guild_id: int, char_id: int):
+        super().__init__(timeout=None)
+        self.add_item(ApproveButton(guild_id, char_id))
+        self.add_item(RejectButton(guild_id, char_id))
+
 class RejectModal(ui.Modal, title="Reject Character"):
     reason = ui.TextInput(label="Reason (optional)", style=discord.TextStyle.paragraph, required=False)
 
@@ -235,56 +283,198 @@ class RejectModal(ui.Modal, title="Reject Character"):
         if not isinstance(interaction.user, discord.Member) or not is_reviewer(interaction.user, settings):
             return await interaction.response.send_message("You can’t reject this.", ephemeral=True)
 
-        await DB.set_status(self.guild_id, self.char_id, "rejected", interaction.user.id, str(self.reason) or None)
-        row = await DB.get_character(self.guild_id, self.char_id)
+        row, decided = await DB.decide(self.guild_id, self.char_id, "rejected", interaction.user.id,
+                                       str(self.reason) or None, self.review_message_id)
+        if row is None:
+            return await interaction.response.edit_message(content="This character no longer exists.", embed=None, view=None)
         await interaction.response.edit_message(embed=char_embed(row), view=None)
-
-        # Clean up mapping so we don't try to reattach on reboot
+        if not decided:
+            return await interaction.followup.send(
+                f"Character **#{self.char_id}** was already {row.status} by <@{row.reviewed_by}>.", ephemeral=True
+            )
+
+class BulkFollowup:
+    """
+    Discord side of /apps_bulk, run in the background after the DB transaction: edits the review
+    messages one at a time (so discord.py's per-route limiter paces them) while one ephemeral
+    message shows progress. Owner DMs were queued in the outbox with the decisions.
+    """
+
+    def __init__(self, interaction: discord.Interaction, rows: list[Character], messages: dict[int, tuple[int, int]],
+                 note: str = ""):
+        self.interaction = interaction
+        self.rows = rows
+        self.messages = messages
+        self.note = note
+        self.edited = self.edit_failed = 0
+
+    def progress(self, done: bool = False) -> str:
+        status = self.rows[0].status if self.rows else "decided"
+        head = f"{'✅' if done else '⏳'} {len(self.rows)} application(s) {status}.{self.note}"
+        return (f"{head}\nReview messages updated: {self.edited + self.edit_failed}/{len(self.messages)}"
+                f"{f' ({self.edit_failed} missing)' if self.edit_failed else ''}"
+                f"\nOwners are notified in the background.")
+
+    async def run(self):
+        work = asyncio.ensure_future(self._edit_reviews())
         try:
-            await DB.delete_review_message(self.guild_id, self.review_message_id)
-        except Exception:
-            pass
-
+            while not work.done():
+                await asyncio.wait([work], timeout=BULK_PROGRESS_INTERVAL)
+                if not work.done():
+                    await self._report()
+            await work
+        finally:
+            if not work.done():
+                work.cancel()
+        await self._report(done=True)
+
+    async def _report(self, done: bool = False):
         try:
-            if row:
-                owner = interaction.guild.get_member(row["owner_id"])
-                if owner:
-                    await owner.send(
-                        f"Your character **{row['name']}** (ID {self.char_id}) was rejected.\n"
-                        f"Reason: {row['decision_reason'] or '—'}"
-                    )
-        except Exception:
-            pass
+            await self.interaction.edit_original_response(content=self.progress(done))
+        except discord.HTTPException:
+            pass  # interaction token expired or message gone; the work itself carries on
+
+    async def _edit_reviews(self):
+        guild = self.interaction.guild
+        for row in self.rows:
+            target = self.messages.get(row.id)
+            if not target:
+                continue
+            channel = guild.get_channel_or_thread(target[0])  # type: ignore
+            if channel is None:
+                self.edit_failed += 1
+                continue
+            try:
+                await channel.get_partial_message(target[1]).edit(embed=char_embed(row), view=None)
+                self.edited += 1
+            except Exception:
+                self.edit_failed += 1
 
 class Characters(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.bot.loop.create_task(self.restore_review_views())
-
-    async def restore_review_views(self):
+        # Review buttons are routed by their custom_id ("char:approve:{guild}:{char}"), so every
+        # review message, including ones posted before a restart, works without fetching or editing it.
+        self.bot.add_dynamic_items(ApproveButton, RejectButton)
+        self._reconcile_task = self.bot.loop.create_task(self.reconcile_review_messages())
+        self._bulk_tasks: set[asyncio.Task] = set()
+
+    async def cog_load(self):
+        # Load every face claim once; DB change events keep it current afterwards
+        FACE_CLAIMS.load(await DB.load_field_values(FACE_CLAIM_KEY))
+        DB.on_character_change(FACE_CLAIMS.on_character_change)
+        # Autocomplete index: guilds load on first use, changes apply from then on
+        DB.on_character_change(CHARACTERS.on_character_change)
+
+    async def cog_unload(self):
+        DB.off_character_change(FACE_CLAIMS.on_character_change)
+        DB.off_character_change(CHARACTERS.on_character_change)
+        self.bot.remove_dynamic_items(ApproveButton, RejectButton)
+        self._reconcile_task.cancel()
+        for task in self._bulk_tasks:
+            task.cancel()
+
+    async def reconcile_review_messages(self):
+        """
+        Background startup pass: drop review mappings whose character was decided/removed or whose
+        channel/message is gone, then re-post reviews for pending characters without a message.
+        Channels are checked concurrently (bounded by RECONCILE_CONCURRENCY) but each channel's
+        requests run one after another, so we stay inside discord.py's per-route rate-limit buckets.
+        """
         await self.bot.wait_until_ready()
-        print("[restore_review_views] Running...")
-        for guild in self.bot.guilds:
+        sem = asyncio.Semaphore(max(1, RECONCILE_CONCURRENCY))
+        guilds = list(self.bot.guilds)
+        results = await asyncio.gather(*(self._reconcile_guild(g, sem) for g in guilds), return_exceptions=True)
+        dropped = reposted = 0
+        for guild, res in zip(guilds, results):
+            if isinstance(res, BaseException):
+                print(f"[reconcile] Error for guild {guild.id}: {res!r}")
+                continue
+            dropped += res[0]
+            reposted += res[1]
+        print(f"[reconcile] {len(guilds)} guilds: dropped {dropped} stale review mappings, re-posted {reposted} reviews")
+
+    async def _reconcile_guild(self, guild: discord.Guild, sem: asyncio.Semaphore) -> tuple[int, int]:
+        mappings = await DB.list_review_messages(guild.id)
+        gone = [m["message_id"] for m in mappings if m["status"] != "pending"]
+        by_channel: dict[int, list[int]] = defaultdict(list)
+        for m in mappings:
+            if m["status"] == "pending":
+                by_channel[m["channel_id"]].append(m["message_id"])
+        missing = await asyncio.gather(*(self._missing_messages(guild, cid, mids, sem) for cid, mids in by_channel.items()))
+        for mids in missing:
+            gone.extend(mids)
+        if gone:
+            await DB.delete_review_messages(guild.id, gone)
+
+        orphans = await DB.list_unposted_pending(guild.id)
+        if not orphans:
+            return len(gone), 0
+        settings = await DB.get_settings(guild.id) or {}
+        rc_id = settings.get("review_channel_id")
+        channel = guild.get_channel(int(rc_id)) if rc_id else None
+        if channel is None:
+            return len(gone), 0
+        reposted = 0
+        for row in orphans:
+            async with sem:
+                try:
+                    msg = await channel.send(embed=char_embed(row), view=ReviewButtons(guild.id, row.id))
+                except discord.HTTPException as e:
+                    print(f"[reconcile] Could not re-post review for character {row.id} in guild {guild.id}: {e}")
+                    break
+            await DB.save_review_message(guild.id, channel.id, msg.id, row.id)
+            reposted += 1
+        return len(gone), reposted
+
+    async def _missing_messages(self, guild: discord.Guild, channel_id: int, message_ids: list[int],
+                                sem: asyncio.Semaphore) -> list[int]:
+        """
+        Return the ids in message_ids that no longer exist in the channel.
+        fetch_message costs one request per review; paging history forward costs one request per
+        100 messages posted since the oldest review, decided ones included. History is read while
+        it is cheaper: after each page the pages still needed are estimated from the posting rate
+        seen so far (snowflakes carry timestamps), and once that exceeds the reviews left, the rest
+        are fetched one by one.
+        """
+        channel = guild.get_channel_or_thread(channel_id)
+        if channel is None:
+            return message_ids
+        ids = sorted(message_ids)
+        gone: list[int] = []
+        done = 0  # ids[:done] are resolved
+        async with sem:
             try:
-                if not hasattr(DB, "list_review_messages"):
-                    print(f"[restore_review_views] DB.list_review_messages missing for guild {guild.id}")
-                    continue
-                review_msgs = await DB.list_review_messages(guild.id)
-                print(f"[restore_review_views] Found {len(review_msgs)} review messages for guild {guild.id}")
-                for msg_info in review_msgs:
-                    channel = guild.get_channel(msg_info['channel_id'])
-                    if not channel:
-                        print(f"[restore_review_views] Channel {msg_info['channel_id']} not found in guild {guild.id}")
-                        continue
+                cursor = ids[0] - 1
+                pages = 0
+                while len(ids) - done > 1:
+                    page = [m.id async for m in channel.history(limit=HISTORY_PAGE, after=discord.Object(id=cursor),
+                                                                 oldest_first=True)]
+                    pages += 1
+                    seen = set(page)
+                    # A short page reached the end of the channel: every later id is gone
+                    reached = page[-1] if len(page) == HISTORY_PAGE else ids[-1]
+                    while done < len(ids) and ids[done] <= reached:
+                        if ids[done] not in seen:
+                            gone.append(ids[done])
+                        done += 1
+                    if len(page) < HISTORY_PAGE:
+                        break
+                    cursor = page[-1]
+                    per_page = max(1, ((cursor >> 22) - (ids[0] >> 22)) / pages)
+                    if ((ids[-1] >> 22) - (cursor >> 22)) / per_page >= len(ids) - done:
+                        break
+                for mid in ids[done:]:
                     try:
-                        msg = await channel.fetch_message(msg_info['message_id'])
-                        view = ReviewButtons(guild.id, msg_info['char_id'])
-                        await msg.edit(view=view)
-                        print(f"[restore_review_views] Restored view for message {msg_info['message_id']} in channel {msg_info['channel_id']}")
-                    except Exception as e:
-                        print(f"[restore_review_views] Failed to restore view for message {msg_info['message_id']}: {e}")
-            except Exception as e:
-                print(f"[restore_review_views] Error for guild {guild.id}: {e}")
+                        await channel.fetch_message(mid)
+                    except discord.NotFound:
+                        gone.append(mid)
+                return gone
+            except discord.NotFound:
+                return message_ids
+            except discord.Forbidden:
+                # Can't see the channel any more; keep the mappings rather than guess
+                return []
 
     @app_commands.command(name="apply", description="Apply for a character (admin review required).")
     async def apply(self, interaction: discord.Interaction):
@@ -303,16 +493,18 @@ class Characters(commands.Cog):
             row = await DB.get_character(gid, id)
             if not row:
                 return await interaction.response.send_message("Character not found (in this server).", ephemeral=True)
-            if row["owner_id"] != interaction.user.id and not interaction.user.guild_permissions.manage_guild:
+            if row.owner_id != interaction.user.id and not interaction.user.guild_permissions.manage_guild:
                 return await interaction.response.send_message("You don’t have access to that character.", ephemeral=True)
-            return await interaction.response.send_message(embed=char_embed(dict(row)), ephemeral=True)
-        else:
-            rows = await DB.list_my_characters(gid, interaction.user.id)
-            if not rows:
-                return await interaction.response.send_message("You have no characters in this server. Try **/apply**.", ephemeral=True)
-            lines = [f"**#{r['id']}** — {r['name']} — *{r['status']}*" for r in rows[:5]]
-            more = f"\n…and {len(rows)-5} more." if len(rows) > 5 else ""
-            await interaction.response.send_message("\n".join(lines) + more, ephemeral=True)
+            return await interaction.response.send_message(embed=char_embed(row), ephemeral=True)
+        pager = KeysetPager(
+            interaction.user.id,
+            fetch=lambda cursor, limit: DB.list_my_characters(gid, interaction.user.id, before_id=cursor, limit=limit),
+            cursor_of=lambda r: r["id"],
+            render=lambda rows, page: f"**Your characters** — page {page + 1}\n"
+                                      + "\n".join(f"**#{r['id']}** — {r['name']} — *{r['status']}*" for r in rows),
+            page_size=CHARACTERS_PAGE_SIZE,
+        )
+        await pager.start(interaction, "You have no characters in this server. Try **/apply**.")
 
     @app_commands.command(name="unlink", description="Remove one of your characters (only if you own it).")
     @app_commands.describe(id="Character ID to remove (from this server)")
@@ -325,19 +517,143 @@ class Characters(commands.Cog):
         else:
             await interaction.response.send_message("Couldn’t remove (wrong ID or not your character in this server).", ephemeral=True)
 
+    @characters.autocomplete("id")
+    async def _characters_id_autocomplete(self, interaction: discord.Interaction, current: str):
+        if not interaction.guild:
+            return []
+        # Same scope as viewing: your own characters, or every character for managers
+        mine = None if interaction.user.guild_permissions.manage_guild else interaction.user.id  # type: ignore
+        return await character_choices(interaction.guild_id, current, owner_id=mine)  # type: ignore
+
+    @unlink.autocomplete("id")
+    async def _unlink_id_autocomplete(self, interaction: discord.Interaction, current: str):
+        if not interaction.guild:
+            return []
+        return await character_choices(interaction.guild_id, current, owner_id=interaction.user.id)  # type: ignore
+
+    @app_commands.command(name="characters_by", description="Reviewers: find characters by an application answer.")
+    @app_commands.describe(field="Form field key, e.g. occupation", value="Exact answer (case-insensitive)")
+    async def characters_by(self, interaction: discord.Interaction, field: str, value: str):
+        if not interaction.guild:
+            return await interaction.response.send_message("Use this in a server.", ephemeral=True)
+        settings = await DB.get_settings(interaction.guild_id)  # type: ignore
+        if not isinstance(interaction.user, discord.Member) or not is_reviewer(interaction.user, settings):
+            return await interaction.response.send_message("You can’t use this.", ephemeral=True)
+        gid, key, value = interaction.guild_id, field.strip().lower(), value.strip()
+        pager = KeysetPager(
+            interaction.user.id,
+            fetch=lambda cursor, limit: DB.find_by_field(gid, key, value, limit=limit, after_id=cursor or 0),  # type: ignore
+            cursor_of=lambda r: r["id"],
+            render=lambda rows, page: f"**{clip(key, 50)} = {clip(value, 100)}** — page {page + 1}\n"
+                                      + "\n".join(f"**#{r['id']}** — {clip(r['name'], APPS_NAME_MAX)} — "
+                                                  f"<@{r['owner_id']}> — *{r['status']}*" for r in rows),
+            page_size=APPS_PAGE_MAX,
+        )
+        await pager.start(interaction, "No characters match.")
+
+    @app_commands.command(name="search", description="Search characters in this server by name, bio or answers.")
+    @app_commands.describe(query="Words to look for (prefixes match too)", status="Only this status",
+                           owner="Only this member's characters")
+    async def search(self, interaction: discord.Interaction, query: str,
+                     status: Optional[Literal["pending", "approved", "rejected"]] = None,
+                     owner: Optional[discord.Member] = None):
+        if not interaction.guild:
+            return await interaction.response.send_message("Use this in a server.", ephemeral=True)
+        gid = interaction.guild_id
+        settings = await DB.get_settings(gid)  # type: ignore
+        # Non-reviewers see approved characters, plus anything of their own
+        if not (isinstance(interaction.user, discord.Member) and is_reviewer(interaction.user, settings)):
+            if not (owner and owner.id == interaction.user.id):
+                status = "approved"
+        owner_id = owner.id if owner else None
+
+        async def fetch(offset, limit):
+            offset = offset or 0
+            rows = await DB.search_characters(gid, query, status, owner_id, limit=limit, offset=offset)  # type: ignore
+            return [{**dict(r), "pos": offset + i} for i, r in enumerate(rows)]
+
+        pager = KeysetPager(
+            interaction.user.id,
+            fetch=fetch,
+            cursor_of=lambda r: r["pos"] + 1,
+            render=lambda rows, page: f"**Search:** {query[:100]} — page {page + 1}\n"
+                                      + "\n".join(f"**#{r['id']}** — {r['name']} — <@{r['owner_id']}> — *{r['status']}*"
+                                                  for r in rows),
+            page_size=CHARACTERS_PAGE_SIZE,
+        )
+        await pager.start(interaction, "No characters match.")
+
     @app_commands.command(name="apps", description="Admin: view pending applications in this server.")
-    @app_commands.describe(limit="Max rows (default 20)")
-    async def apps(self, interaction: discord.Interaction, limit: Optional[int] = 20):
+    @app_commands.describe(limit=f"Rows per page (default and max {APPS_PAGE_MAX})")
+    async def apps(self, interaction: discord.Interaction,
+                   limit: Optional[app_commands.Range[int, 1, APPS_PAGE_MAX]] = APPS_PAGE_MAX):
         if not interaction.guild:
             return await interaction.response.send_message("Use this in a server.", ephemeral=True)
         settings = await DB.get_settings(interaction.guild_id)  # type: ignore
         if not isinstance(interaction.user, discord.Member) or not is_reviewer(interaction.user, settings):
             return await interaction.response.send_message("You can’t use this.", ephemeral=True)
-        rows = await DB.list_pending(interaction.guild_id, limit or 20)  # type: ignore
+        gid = interaction.guild_id
+        pager = KeysetPager(
+            interaction.user.id,
+            fetch=lambda cursor, n: DB.list_pending(gid, n, after=cursor),  # type: ignore
+            cursor_of=lambda r: (r["submitted_at"], r["id"]),
+            render=lambda rows, page: f"**Pending applications** — page {page + 1}\n"
+                                      + "\n".join(f"**#{r['id']}** — {clip(r['name'], APPS_NAME_MAX)} — <@{r['owner_id']}>"
+                                                  for r in rows),
+            page_size=limit or APPS_PAGE_MAX,
+        )
+        await pager.start(interaction, "No pending applications.")
+
+    @app_commands.command(name="apps_bulk", description="Admin: approve or reject many pending applications at once.")
+    @app_commands.describe(
+        action="Approve or reject",
+        ids="Character IDs separated by spaces/commas, or 'all' for every pending application matching the filters",
+        owner="Only this member's applications",
+        older_than_days="Only applications submitted at least this many days ago",
+        reason="Reason sent to owners (rejections)",
+    )
+    async def apps_bulk(self, interaction: discord.Interaction, action: Literal["approve", "reject"], ids: str,
+                        owner: Optional[discord.Member] = None,
+                        older_than_days: Optional[app_commands.Range[int, 0, 3650]] = None,
+                        reason: Optional[app_commands.Range[str, 1, 1000]] = None):
+        if not interaction.guild:
+            return await interaction.response.send_message("Use this in a server.", ephemeral=True)
+        settings = await DB.get_settings(interaction.guild_id)  # type: ignore
+        if not isinstance(interaction.user, discord.Member) or not is_reviewer(interaction.user, settings):
+            return await interaction.response.send_message("You can’t use this.", ephemeral=True)
+
+        char_ids = None
+        if ids.strip().lower() != "all":
+            tokens = [t for t in re.split(r"[\s,]+", ids) if t.lstrip("#")]
+            if not tokens or not all(t.lstrip("#").isdigit() for t in tokens):
+                return await interaction.response.send_message("Give character IDs (e.g. `12 15 #20`) or `all`.", ephemeral=True)
+            char_ids = sorted({int(t.lstrip("#")) for t in tokens})
+            if len(char_ids) > BULK_MAX:
+                return await interaction.response.send_message(f"At most {BULK_MAX} IDs at a time.", ephemeral=True)
+        before = None
+        if older_than_days is not None:
+            before = (discord.utils.utcnow() - datetime.timedelta(days=older_than_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        status = "approved" if action == "approve" else "rejected"
+        rows, messages, remaining = await DB.decide_many(
+            interaction.guild_id, status, interaction.user.id, reason,  # type: ignore
+            char_ids=char_ids, owner_id=owner.id if owner else None, submitted_before=before, limit=BULK_MAX,
+        )
         if not rows:
-            return await interaction.response.send_message("No pending applications.", ephemeral=True)
-        lines = [f"**#{r['id']}** — {r['name']} — <@{r['owner_id']}>" for r in rows]
-        await interaction.response.send_message("\n".join(lines), ephemeral=True)
+            return await interaction.edit_original_response(content="No pending applications matched.")
+
+        skipped = len(char_ids) - len(rows) if char_ids else 0
+        note = f" ({skipped} of the IDs weren’t pending.)" if skipped else ""
+        if remaining:
+            note += (f"\n⚠️ Stopped at {BULK_MAX} per run: {remaining} more pending application(s) match. "
+                     "Run the command again to continue.")
+        followup = BulkFollowup(interaction, rows, messages, note)
+        # The deferred "thinking" reply becomes the progress message
+        await interaction.edit_original_response(content=followup.progress())
+        task = asyncio.create_task(followup.run())
+        self._bulk_tasks.add(task)
+        task.add_done_callback(self._bulk_tasks.discard)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Characters(bot))
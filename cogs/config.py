@@ -96,6 +96,17 @@ class Config(commands.Cog):
         else:
             await inter.response.send_message("✅ Reviewer role cleared (admins only).", ephemeral=True)
 
+    @app_commands.command(name="config_notifychannel", description="Set where members are pinged when their DMs are closed.")
+    @app_commands.describe(channel="Channel for decision notices to members who don't accept DMs. Leave empty to clear.")
+    async def config_notifychannel(self, inter: discord.Interaction, channel: discord.TextChannel | None = None):
+        if not need_manage_guild(inter):
+            return await inter.response.send_message("You need **Manage Server** to do this.", ephemeral=True)
+        await DB.set_notify_channel(inter.guild_id, channel.id if channel else None)  # type: ignore
+        if channel:
+            await inter.response.send_message(f"✅ Notify channel set to {channel.mention}.", ephemeral=True)
+        else:
+            await inter.response.send_message("✅ Notify channel cleared (DMs only).", ephemeral=True)
+
     @app_commands.command(name="config_show", description="Show current config for this server.")
     async def config_show(self, inter: discord.Interaction):
         row = await DB.get_settings(inter.guild_id)  # type: ignore
@@ -103,9 +114,11 @@ class Config(commands.Cog):
             return await inter.response.send_message("No settings yet. Set a review channel with **/config_reviewchannel**.", ephemeral=True)
         channel = inter.guild.get_channel(row["review_channel_id"]) if row["review_channel_id"] else None  # type: ignore
         role = inter.guild.get_role(row["reviewer_role_id"]) if row["reviewer_role_id"] else None  # type: ignore
+        notify = inter.guild.get_channel(row["notify_channel_id"]) if row.get("notify_channel_id") else None  # type: ignore
         lines = [
             f"**Review channel:** {channel.mention if channel else '—'}",
             f"**Reviewer role:** {role.mention if role else 'Admins only'}",
+            f"**Notify channel (closed DMs):** {notify.mention if notify else '—'}",
         ]
         await inter.response.send_message("\n".join(lines), ephemeral=True)
 
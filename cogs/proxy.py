@@ -0,0 +1,170 @@
+# cogs/proxy.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+from utils.character_index import character_choices
+from utils.db import DB
+from utils.models import Character
+from utils.proxy_matcher import PROXIES
+from utils.storage import WEBHOOKS, WebhooksDenied
+from utils.webhook_dispatch import WebhookNotFound
+
+def webhook_target(channel) -> tuple[discord.abc.GuildChannel, int | None]:
+    """Webhooks live on the parent channel; threads are addressed with thread_id."""
+    if isinstance(channel, discord.Thread):
+        return channel.parent, channel.id  # type: ignore
+    return channel, None
+
+class Proxy(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        # Load every proxy trigger once; DB change events keep it current afterwards
+        PROXIES.load(await DB.list_proxies())
+        DB.on_character_change(PROXIES.on_character_change)
+
+    async def cog_unload(self):
+        DB.off_character_change(PROXIES.on_character_change)
+
+    # Permission changes may grant Manage Webhooks: let ensure() ask Discord again
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        WEBHOOKS.allow(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.permissions != after.permissions:
+            WEBHOOKS.allow(*(c.id for c in after.guild.channels))
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if after.id == self.bot.user.id and before.roles != after.roles:  # type: ignore
+            WEBHOOKS.allow(*(c.id for c in after.guild.channels))
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.author.bot or message.webhook_id or not message.guild:
+            return
+        hit = PROXIES.match(message.guild.id, message.author.id, message.content)
+        if hit is None:
+            return
+        entry, text = hit
+        text = text.strip()
+        if not text and not message.attachments:
+            return
+        if WEBHOOKS.denied(webhook_target(message.channel)[0].id):
+            return
+        # Attachments are re-uploaded with the post: their CDN links die with the original message.
+        # Anything over the guild's upload limit stays as the user posted it.
+        if sum(a.size for a in message.attachments) > message.guild.filesize_limit:
+            return
+        try:
+            files = [await a.to_file(spoiler=a.is_spoiler()) for a in message.attachments]
+        except discord.HTTPException as e:
+            print(f"[proxy] Could not download attachments of message {message.id}: {e!r}")
+            return
+        try:
+            await self.send_as(message.channel, entry, text[:2000], files=files)
+        except WebhooksDenied:
+            print(f"[proxy] Missing Manage Webhooks in channel {message.channel.id}; not proxying there for now")
+            return
+        except Exception as e:
+            print(f"[proxy] Failed to proxy message {message.id} as character {entry.id}: {e!r}")
+            return
+        try:
+            await message.delete()
+        except discord.HTTPException:
+            pass
+
+    async def send_as(self, channel, char: Character, content: str, files: list[discord.File] | None = None):
+        """Post `content` (and `files`) as the character through the channel's bot-owned webhook.
+        Steady state is one cached lookup plus one queued send; the webhook is only
+        re-provisioned after Discord answers 404."""
+        parent, thread_id = webhook_target(channel)
+        try:
+            for attempt in range(2):
+                url = await WEBHOOKS.ensure(parent)
+                fut, _ = self.bot.webhook_dispatcher.submit(  # type: ignore
+                    url, channel.id, content=content or None, files=files,
+                    username=char.display_name, avatar_url=char.avatar_url, thread_id=thread_id,
+                )
+                try:
+                    return await fut
+                except WebhookNotFound:
+                    await WEBHOOKS.forget(parent.id, url)
+                    if attempt:
+                        raise
+        finally:
+            for f in files or ():
+                f.close()
+
+    @app_commands.command(name="post_as", description="Post a message as one of your approved characters.")
+    @app_commands.describe(character="Character ID", message="What your character says")
+    async def post_as(self, inter: discord.Interaction, character: int, message: app_commands.Range[str, 1, 2000]):
+        if not inter.guild:
+            return await inter.response.send_message("Use this in a server.", ephemeral=True)
+        row = await DB.get_character(inter.guild_id, character)  # type: ignore
+        if not row or row.owner_id != inter.user.id:
+            return await inter.response.send_message("Character not found (or not yours) in this server.", ephemeral=True)
+        if row.status != "approved":
+            return await inter.response.send_message("Only approved characters can post.", ephemeral=True)
+
+        await inter.response.defer(ephemeral=True)
+        try:
+            await self.send_as(inter.channel, row, message)
+            await inter.followup.send(f"✅ Posted as **{row.display_name}**.", ephemeral=True)
+        except (discord.Forbidden, WebhooksDenied):
+            await inter.followup.send("❌ I need **Manage Webhooks** in this channel to post as characters.", ephemeral=True)
+        except Exception as e:
+            await inter.followup.send(f"❌ {e}", ephemeral=True)
+
+    @app_commands.command(name="proxy_set", description="Set a prefix that makes your messages post as a character (e.g. jo:).")
+    @app_commands.describe(character="Character ID (must be approved)", prefix="Trigger typed at the start of a message",
+                           display_name="Name shown on proxied posts (defaults to the character name)")
+    async def proxy_set(self, inter: discord.Interaction, character: int, prefix: app_commands.Range[str, 1, 32],
+                        display_name: app_commands.Range[str, 1, 80] | None = None):
+        if not inter.guild:
+            return await inter.response.send_message("Use this in a server.", ephemeral=True)
+        row = await DB.get_character(inter.guild_id, character)  # type: ignore
+        if not row or row.owner_id != inter.user.id:
+            return await inter.response.send_message("Character not found (or not yours) in this server.", ephemeral=True)
+        if row.status != "approved":
+            return await inter.response.send_message("Only approved characters can be proxied.", ephemeral=True)
+        prefix = prefix.strip()
+        if not prefix:
+            return await inter.response.send_message("The prefix can’t be empty or only spaces.", ephemeral=True)
+        display_name = display_name.strip() if display_name else None
+        taken = PROXIES.owner_prefixes(inter.guild_id, inter.user.id).get(prefix.lower())  # type: ignore
+        if taken and taken != character:
+            return await inter.response.send_message(f"Prefix `{prefix}` is already used by your character **#{taken}**.", ephemeral=True)
+        await DB.set_proxy(inter.guild_id, inter.user.id, character, prefix, display_name or None)  # type: ignore
+        await inter.response.send_message(
+            f"✅ Messages starting with `{prefix}` will now post as **{display_name or row.name}**.", ephemeral=True
+        )
+
+    @app_commands.command(name="proxy_clear", description="Stop proxying messages for one of your characters.")
+    @app_commands.describe(character="Character ID")
+    async def proxy_clear(self, inter: discord.Interaction, character: int):
+        if not inter.guild:
+            return await inter.response.send_message("Use this in a server.", ephemeral=True)
+        row = await DB.set_proxy(inter.guild_id, inter.user.id, character, None)  # type: ignore
+        if not row:
+            return await inter.response.send_message("Character not found (or not yours) in this server.", ephemeral=True)
+        await inter.response.send_message(f"✅ Proxy cleared for **#{character}**.", ephemeral=True)
+
+    @post_as.autocomplete("character")
+    @proxy_set.autocomplete("character")
+    async def _approved_character_autocomplete(self, inter: discord.Interaction, current: str):
+        if not inter.guild_id:
+            return []
+        return await character_choices(inter.guild_id, current, owner_id=inter.user.id, status="approved")
+
+    @proxy_clear.autocomplete("character")
+    async def _own_character_autocomplete(self, inter: discord.Interaction, current: str):
+        if not inter.guild_id:
+            return []
+        return await character_choices(inter.guild_id, current, owner_id=inter.user.id)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Proxy(bot))
@@ -1,11 +1,11 @@
-import discord, aiohttp
+import discord
 from discord.ext import commands
 from discord import app_commands
 from utils.colors import parse_color
-from utils.storage import JsonStore
+from utils.storage import WEBHOOKS
+from utils.webhook_dispatch import QueueFull
 
 NB, EN, EM, THIN = "\u00A0", "\u2002", "\u2003", "\u2009"
-STORE = JsonStore("webhooks.json")
 
 def clamp(text: str | None, n: int) -> str | None:
     if not text: return text
@@ -50,15 +50,34 @@ class RpCards(commands.Cog):
         await inter.response.send_message(embeds=[top, main], allowed_mentions=discord.AllowedMentions.none())
 
     # ---------- Post AS someone (via webhook) ----------
-    async def _send_via_webhook(self, channel_id: int, *, username=None, avatar_url=None,
+    async def _send_via_webhook(self, inter: discord.Interaction, *, username=None, avatar_url=None,
                                 embeds: list[discord.Embed] | None = None, content: str | None = None):
-        url = STORE.get(str(channel_id))
+        """Queue the post on the channel's webhook and keep the user posted (ephemeral)."""
+        await inter.response.defer(ephemeral=True)
+        url = WEBHOOKS.get(inter.channel_id)  # type: ignore
         if not url:
-            raise RuntimeError("No webhook set for this channel. Use /setwebhook first.")
-        async with aiohttp.ClientSession() as s:
-            wh = discord.Webhook.from_url(url, session=s)
-            await wh.send(content=content, username=username, avatar_url=avatar_url,
-                          embeds=embeds, allowed_mentions=discord.AllowedMentions.none(), wait=True)
+            return await inter.followup.send("❌ No webhook set for this channel. Use /setwebhook first.", ephemeral=True)
+        try:
+            fut, ahead = self.bot.webhook_dispatcher.submit(  # type: ignore
+                url, inter.channel_id, content=content, username=username, avatar_url=avatar_url, embeds=embeds,
+            )
+        except QueueFull as e:
+            return await inter.followup.send(f"⏳ This channel is busy ({e}) Try again in a moment.", ephemeral=True)
+        except Exception as e:
+            return await inter.followup.send(f"❌ {e}", ephemeral=True)
+
+        note = None
+        if ahead:
+            note = await inter.followup.send(f"⏳ Queued — {ahead} post(s) ahead of yours.", ephemeral=True, wait=True)
+        try:
+            await fut
+            result = "✅ Sent."
+        except Exception as e:
+            result = f"❌ {e}"
+        if note:
+            await note.edit(content=result)
+        else:
+            await inter.followup.send(result, ephemeral=True)
 
     @app_commands.command(name="instagram_as", description="Instagram-style card posted AS a custom name/avatar.")
     @app_commands.describe(poster_name="Webhook display name", poster_avatar="Webhook avatar URL",
@@ -77,13 +96,8 @@ class RpCards(commands.Cog):
         cap = clamp(description or "", 140)
         bottom = discord.Embed(description=f"**{username}**{EM}{cap}" if cap else f"**{username}**", color=c)
 
-        await inter.response.defer(ephemeral=True)
-        try:
-            await self._send_via_webhook(inter.channel_id, username=poster_name, avatar_url=poster_avatar,
-                                         embeds=[top, mid, bottom])
-            await inter.followup.send("✅ Sent.", ephemeral=True)
-        except Exception as e:
-            await inter.followup.send(f"❌ {e}", ephemeral=True)
+        await self._send_via_webhook(inter, username=poster_name, avatar_url=poster_avatar,
+                                     embeds=[top, mid, bottom])
 
     @app_commands.command(name="spotify_as", description="Spotify-style card posted AS a custom name/avatar.")
     @app_commands.describe(poster_name="Webhook display name", poster_avatar="Webhook avatar URL",
@@ -101,13 +115,8 @@ class RpCards(commands.Cog):
         top = discord.Embed(description=header, color=c)
         main = discord.Embed(description="\n".join(body), color=c); main.set_image(url=cover_url)
 
-        await inter.response.defer(ephemeral=True)
-        try:
-            await self._send_via_webhook(inter.channel_id, username=poster_name, avatar_url=poster_avatar,
-                                         embeds=[top, main])
-            await inter.followup.send("✅ Sent.", ephemeral=True)
-        except Exception as e:
-            await inter.followup.send(f"❌ {e}", ephemeral=True)
+        await self._send_via_webhook(inter, username=poster_name, avatar_url=poster_avatar,
+                                     embeds=[top, main])
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(RpCards(bot))
@@ -0,0 +1,54 @@
+# cogs/stats.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+from utils.db import DB, DECISION_BUCKETS
+
+# Reviewers listed on /stats, busiest first
+STATS_TOP_REVIEWERS = 10
+
+def fmt_duration(seconds: float) -> str:
+    if seconds < 60:
+        return "under a minute"
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours}h {minutes}m" if minutes else f"{hours}h"
+    days, hours = divmod(hours, 24)
+    return f"{days}d {hours}h" if hours else f"{days}d"
+
+class Stats(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="stats", description="Application totals, reviewer activity and review times for this server.")
+    async def stats(self, interaction: discord.Interaction):
+        if not interaction.guild:
+            return await interaction.response.send_message("Use this in a server.", ephemeral=True)
+        stats = await DB.get_guild_stats(interaction.guild.id)
+
+        e = discord.Embed(title=f"📊 {interaction.guild.name}", color=discord.Color.blurple())
+        e.add_field(name="Pending", value=str(stats["pending"]))
+        e.add_field(name="Approved", value=str(stats["approved"]))
+        e.add_field(name="Rejected", value=str(stats["rejected"]))
+
+        median = stats["median_decision_seconds"]
+        if median is None:
+            review_time = "—"
+        elif median >= DECISION_BUCKETS[-1]:
+            review_time = f"over {fmt_duration(DECISION_BUCKETS[-1])}"
+        else:
+            review_time = f"~{fmt_duration(median)}"
+        e.add_field(name="Median time to decision",
+                    value=f"{review_time} ({stats['decisions']} decisions)" if stats["decisions"] else review_time,
+                    inline=False)
+
+        reviewers = stats["reviewers"][:STATS_TOP_REVIEWERS]
+        lines = [f"<@{rid}> — ✅ {approved} · ❌ {rejected}" for rid, approved, rejected in reviewers]
+        e.add_field(name="Reviewers", value="\n".join(lines) if lines else "No decisions yet.", inline=False)
+        await interaction.response.send_message(embed=e, ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Stats(bot))
@@ -0,0 +1,166 @@
+# cogs/transfer.py
+import contextlib, csv, tempfile, time, zlib
+from typing import Literal
+import discord
+from discord.ext import commands
+from discord import app_commands
+from utils.db import DB
+from utils.transfer import ExportWriter, read_records, parse_character, parse_form, SETTINGS_KEYS
+
+# Characters per import transaction
+IMPORT_CHUNK = 500
+# Largest import file accepted (compressed); a 100k-character export is well under this
+IMPORT_MAX_BYTES = 25 * 1024 * 1024
+# Seconds between progress edits of the ephemeral /import message
+IMPORT_PROGRESS_INTERVAL = 2.0
+
+def need_manage_guild(inter: discord.Interaction) -> bool:
+    m = inter.user
+    return isinstance(m, discord.Member) and m.guild_permissions.manage_guild
+
+class ImportProgress:
+    def __init__(self, interaction: discord.Interaction, filename: str):
+        self.interaction = interaction
+        self.filename = filename
+        self.imported = self.pending = self.existing = self.invalid = 0
+        self.form = self.settings = False
+        self._last_report = time.monotonic()
+
+    def text(self, done: bool = False, error: str = "") -> str:
+        head = "✅ Import finished" if done and not error else ("❌ Import stopped" if error else "⏳ Importing")
+        lines = [f"{head}: `{self.filename}`",
+                 f"Characters imported: {self.imported}"]
+        if self.pending:
+            lines.append(f"Pending applications among them: {self.pending} — they get no review messages; "
+                         "see them with **/apps** and decide them with **/apps_bulk**.")
+        if self.existing:
+            lines.append(f"Already here (skipped): {self.existing}")
+        if self.invalid:
+            lines.append(f"Unreadable or invalid records (skipped): {self.invalid}")
+        if self.form:
+            lines.append("Application form restored.")
+        if self.settings:
+            lines.append("Channel/role settings restored.")
+        if error:
+            lines.append(f"Reason: {error} — everything counted above was saved; re-running the import skips it.")
+        return "\n".join(lines)
+
+    async def report(self, done: bool = False, error: str = ""):
+        if not done and time.monotonic() - self._last_report < IMPORT_PROGRESS_INTERVAL:
+            return
+        self._last_report = time.monotonic()
+        try:
+            await self.interaction.edit_original_response(content=self.text(done, error))
+        except discord.HTTPException:
+            pass  # interaction token expired; the import itself carries on
+
+class Transfer(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="export", description="Admin: download this server's characters, form and settings.")
+    @app_commands.describe(format="ndjson (everything, re-importable) or csv (characters only, for spreadsheets)")
+    async def export(self, interaction: discord.Interaction, format: Literal["ndjson", "csv"] = "ndjson"):
+        if not interaction.guild:
+            return await interaction.response.send_message("Use this in a server.", ephemeral=True)
+        if not need_manage_guild(interaction):
+            return await interaction.response.send_message("You need **Manage Server** to do this.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        guild = interaction.guild
+        # Rows go from the DB cursor through gzip into a temp file on disk one batch at a time
+        with tempfile.TemporaryFile() as fp:
+            writer = ExportWriter(fp, format)
+            writer.header(guild.id, await DB.get_settings(guild.id), await DB.get_form(guild.id))
+            async with contextlib.aclosing(DB.iter_guild_characters(guild.id)) as batches:
+                async for chars in batches:
+                    writer.characters(chars)
+            writer.close()
+
+            size = fp.tell()
+            if size > guild.filesize_limit:
+                return await interaction.followup.send(
+                    f"❌ The export is {size / 2**20:.1f} MiB, over this server's "
+                    f"{guild.filesize_limit / 2**20:.0f} MiB upload limit.", ephemeral=True)
+            fp.seek(0)
+            await interaction.followup.send(
+                f"📦 {writer.count} character(s) exported.",
+                file=discord.File(fp, filename=f"characters-{guild.id}.{format}.gz"),
+                ephemeral=True,
+            )
+
+    @app_commands.command(name="import", description="Admin: load characters (and form/settings) from an /export file.")
+    @app_commands.describe(file="A .ndjson.gz or .csv.gz file made by /export (uncompressed works too)")
+    async def import_(self, interaction: discord.Interaction, file: discord.Attachment):
+        if not interaction.guild:
+            return await interaction.response.send_message("Use this in a server.", ephemeral=True)
+        if not need_manage_guild(interaction):
+            return await interaction.response.send_message("You need **Manage Server** to do this.", ephemeral=True)
+        if file.size > IMPORT_MAX_BYTES:
+            return await interaction.response.send_message(
+                f"That file is over {IMPORT_MAX_BYTES // 2**20} MiB.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        guild_id = interaction.guild.id
+        progress = ImportProgress(interaction, file.filename)
+        source_guild = None
+        chunk: list[dict] = []
+
+        async def flush():
+            inserted = await DB.import_characters(guild_id, chunk)
+            progress.imported += len(inserted)
+            progress.pending += sum(c.status == "pending" for c in inserted)
+            progress.existing += len(chunk) - len(inserted)
+            chunk.clear()
+            await progress.report()
+
+        with tempfile.TemporaryFile() as fp:
+            await file.save(fp)
+            fp.seek(0)
+            try:
+                for kind, data in read_records(fp):
+                    if kind == "character":
+                        try:
+                            chunk.append(parse_character(data))
+                        except (ValueError, TypeError):
+                            progress.invalid += 1
+                        if len(chunk) >= IMPORT_CHUNK:
+                            await flush()
+                    elif kind == "export":
+                        source_guild = data.get("guild_id")
+                    elif kind == "form":
+                        try:
+                            await DB.set_form(guild_id, parse_form(data))
+                            progress.form = True
+                        except (ValueError, TypeError):
+                            progress.invalid += 1
+                    elif kind == "settings":
+                        # Channel and role ids only mean something in the server they came from
+                        if source_guild == guild_id:
+                            await self._restore_settings(guild_id, data)
+                            progress.settings = True
+                    else:
+                        progress.invalid += 1
+                if chunk:
+                    await flush()
+            except (OSError, EOFError, UnicodeDecodeError, csv.Error, zlib.error) as e:
+                print(f"[Import] guild {guild_id}: unreadable file {file.filename!r}: {e!r}")
+                return await progress.report(done=True, error="the file isn't a readable export")
+            except Exception as e:
+                print(f"[Import] guild {guild_id}: failed after {progress.imported} characters: {e!r}")
+                return await progress.report(done=True, error="saving to the database failed")
+        print(f"[Import] guild {guild_id}: {progress.imported} imported, {progress.existing} existing, "
+              f"{progress.invalid} invalid")
+        await progress.report(done=True)
+
+    async def _restore_settings(self, guild_id: int, data: dict):
+        settings = {k: data.get(k) for k in SETTINGS_KEYS}
+        if settings["review_channel_id"]:
+            await DB.set_review_channel(guild_id, int(settings["review_channel_id"]))
+        if settings["reviewer_role_id"]:
+            await DB.set_reviewer_role(guild_id, int(settings["reviewer_role_id"]))
+        if settings["notify_channel_id"]:
+            await DB.set_notify_channel(guild_id, int(settings["notify_channel_id"]))
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Transfer(bot))
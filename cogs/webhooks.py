@@ -1,9 +1,7 @@
-import discord, aiohttp
+import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.storage import JsonStore
-
-STORE = JsonStore("webhooks.json")
+from utils.storage import WEBHOOKS
 
 def _can_set(inter: discord.Interaction):
     p = inter.channel.permissions_for(inter.user)  # type: ignore
@@ -22,22 +20,35 @@ class Webhooks(commands.Cog):
             )
         if not url.startswith("https://discord.com/api/webhooks/"):
             return await inter.response.send_message("That doesn't look like a Discord webhook URL.", ephemeral=True)
-        STORE.set(str(inter.channel_id), url)
+        await WEBHOOKS.set(inter.channel_id, url)
         await inter.response.send_message("✅ Webhook saved for this channel.", ephemeral=True)
 
     @app_commands.command(name="testwebhook", description="Send a quick test through the saved webhook.")
     async def testwebhook(self, inter: discord.Interaction):
-        url = STORE.get(str(inter.channel_id))
-        if not url:
+        wh = WEBHOOKS.webhook(inter.channel_id, self.bot.http_session)  # type: ignore
+        if wh is None:
             return await inter.response.send_message("No webhook set. Run **/setwebhook** first.", ephemeral=True)
         await inter.response.defer(ephemeral=True)
         try:
-            async with aiohttp.ClientSession() as s:
-                wh = discord.Webhook.from_url(url, session=s)
-                await wh.send("Webhook is working ✅", allowed_mentions=discord.AllowedMentions.none())
+            await wh.send("Webhook is working ✅", allowed_mentions=discord.AllowedMentions.none())
             await inter.followup.send("✅ Sent.", ephemeral=True)
         except Exception as e:
             await inter.followup.send(f"❌ Failed: {e}", ephemeral=True)
 
+    @app_commands.command(name="webhook_queue", description="Show webhook posting queue depth and wait times (mods/admins).")
+    async def webhook_queue(self, inter: discord.Interaction):
+        if not _can_set(inter):
+            return await inter.response.send_message(
+                "You need **Manage Webhooks** or **Manage Channels**.", ephemeral=True
+            )
+        stats = self.bot.webhook_dispatcher.stats()  # type: ignore
+        guild_channels = {c.id for c in inter.guild.channels} if inter.guild else {inter.channel_id}
+        lines = [
+            f"<#{cid}> — queued **{st['depth']}**, sent {st['sent']}, failed {st['failed']}, "
+            f"429s {st['rate_limited']}, avg wait {st['avg_wait_ms']:.0f} ms, max {st['max_wait_ms']:.0f} ms"
+            for cid, st in stats.items() if cid in guild_channels
+        ]
+        await inter.response.send_message("\n".join(lines) or "No webhook posts yet.", ephemeral=True)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Webhooks(bot))
@@ -0,0 +1,126 @@
+# utils/character_index.py
+import asyncio
+from bisect import bisect_left, insort
+from typing import Awaitable, Callable, Iterable, Optional
+
+from discord import app_commands
+
+from utils.db import DB
+from utils.models import Character
+
+# Autocomplete shows at most this many choices (Discord's limit)
+MAX_SUGGESTIONS = 25
+
+class _GuildIndex:
+    __slots__ = ("chars", "names", "by_owner")
+
+    def __init__(self):
+        # char_id -> (owner_id, name, status)
+        self.chars: dict[int, tuple[int, str, str]] = {}
+        # sorted (casefolded name, char_id), for the guild and per owner
+        self.names: list[tuple[str, int]] = []
+        self.by_owner: dict[int, list[tuple[str, int]]] = {}
+
+    def add(self, char_id: int, owner_id: int, name: str, status: str):
+        self.remove(char_id)
+        self.chars[char_id] = (owner_id, name, status)
+        key = (name.casefold(), char_id)
+        insort(self.names, key)
+        insort(self.by_owner.setdefault(owner_id, []), key)
+
+    def remove(self, char_id: int):
+        old = self.chars.pop(char_id, None)
+        if old is None:
+            return
+        key = (old[1].casefold(), char_id)
+        _discard(self.names, key)
+        owned = self.by_owner.get(old[0])
+        if owned is not None:
+            _discard(owned, key)
+            if not owned:
+                del self.by_owner[old[0]]
+
+def _discard(keys: list, key):
+    i = bisect_left(keys, key)
+    if i < len(keys) and keys[i] == key:
+        del keys[i]
+
+class CharacterIndex:
+    """
+    Character names per guild (and per owner within it) in sorted lists, so autocomplete is a
+    bisect over memory instead of a query per keystroke. A guild is loaded from the DB the first
+    time someone autocompletes in it; DB character change events keep loaded guilds current.
+    """
+
+    def __init__(self, loader: Callable[[int], Awaitable[Iterable]] = DB.list_guild_characters):
+        self.loader = loader
+        self._guilds: dict[int, _GuildIndex] = {}
+        self._loading: dict[int, asyncio.Task] = {}
+        # changes that arrive while a guild is loading, replayed over the loaded rows
+        self._missed: dict[int, list[tuple[str, Character]]] = {}
+
+    async def _guild(self, guild_id: int) -> _GuildIndex:
+        index = self._guilds.get(guild_id)
+        if index is not None:
+            return index
+        # Keystrokes that arrive while the guild is loading share one query
+        task = self._loading.get(guild_id)
+        if task is None:
+            task = self._loading[guild_id] = asyncio.create_task(self._load(guild_id))
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._loading.pop(guild_id, None)
+
+    async def _load(self, guild_id: int) -> _GuildIndex:
+        self._missed[guild_id] = []
+        try:
+            index = _GuildIndex()
+            for row in await self.loader(guild_id):
+                index.add(row["id"], row["owner_id"], row["name"], row["status"])
+            for event, row in self._missed[guild_id]:
+                _apply(index, event, row)
+        finally:
+            del self._missed[guild_id]
+        self._guilds[guild_id] = index
+        return index
+
+    async def suggest(self, guild_id: int, prefix: str, owner_id: Optional[int] = None,
+                      status: Optional[str] = None, limit: int = MAX_SUGGESTIONS) -> list[tuple[int, str, str]]:
+        """(char_id, name, status) whose name starts with `prefix` (case-insensitive), by name."""
+        index = await self._guild(guild_id)
+        keys = index.names if owner_id is None else index.by_owner.get(owner_id, [])
+        prefix = prefix.strip().casefold()
+        out = []
+        for i in range(bisect_left(keys, (prefix, -1)), len(keys)):
+            name, char_id = keys[i]
+            if not name.startswith(prefix) or len(out) >= limit:
+                break
+            _, display, char_status = index.chars[char_id]
+            if status is None or char_status == status:
+                out.append((char_id, display, char_status))
+        return out
+
+    def on_character_change(self, event: str, char: Character):
+        """DB listener: only guilds that have been loaded are kept up to date."""
+        index = self._guilds.get(char.guild_id)
+        if index is not None:
+            _apply(index, event, char)
+        elif char.guild_id in self._missed:
+            self._missed[char.guild_id].append((event, char))
+
+async def character_choices(guild_id: int, current: str, owner_id: Optional[int] = None,
+                            status: Optional[str] = None) -> list[app_commands.Choice[int]]:
+    """Autocomplete choices for a character id parameter, from CHARACTERS."""
+    rows = await CHARACTERS.suggest(guild_id, current, owner_id, status)
+    return [app_commands.Choice(name=f"#{cid} {name} ({st})"[:100], value=cid) for cid, name, st in rows]
+
+def _apply(index: _GuildIndex, event: str, char: Character):
+    if event == "deleted":
+        index.remove(char.id)
+    else:
+        index.add(char.id, char.owner_id, char.name, char.status)
+
+# Shared index; the Characters cog subscribes it to DB change events
+CHARACTERS = CharacterIndex()
@@ -1,16 +1,39 @@
 # utils/db.py
 import asyncio
 import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import asynccontextmanager
 from typing import Optional
 
 import aiosqlite
 
+from utils.models import Character
+
 DB_PATH = "bot.db"
 
+# ---------- connection pool tuning ----------
+# One writer connection plus this many readers (WAL lets readers run alongside the writer).
+DB_READERS = int(os.getenv("DB_READERS", "4"))
+# sqlite3 keeps this many compiled statements per connection, keyed by SQL text.
+STATEMENT_CACHE_SIZE = 256
+# Applied to every pooled connection right after it is opened.
+PRAGMAS = (
+    ("synchronous", "NORMAL"),    # with WAL: durable on checkpoint, no fsync per commit
+    ("cache_size", "-16000"),     # negative = KiB, so ~16 MB page cache per connection
+    ("mmap_size", "268435456"),   # 256 MB memory-mapped reads
+    ("busy_timeout", "5000"),     # ms to wait on a locked database before SQLITE_BUSY
+    ("temp_store", "MEMORY"),
+)
+# Group commit: the writer task applies up to this many queued mutations per transaction,
+# waiting at most DB_WRITE_BATCH_MS for a batch to fill up.
+WRITE_BATCH_MAX = int(os.getenv("DB_WRITE_BATCH_MAX", "64"))
+WRITE_BATCH_WINDOW = float(os.getenv("DB_WRITE_BATCH_MS", "2")) / 1000
+
 # ---------- SQL ONLY ----------
 INIT_SQL = """
-PRAGMA journal_mode = WAL;
-
 CREATE TABLE IF NOT EXISTS guild_settings (
   guild_id INTEGER PRIMARY KEY,
   review_channel_id INTEGER,
@@ -49,8 +72,32 @@ CREATE TABLE IF NOT EXISTS review_messages (
   PRIMARY KEY (guild_id, message_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_characters_guild_status ON characters(guild_id, status);
-CREATE INDEX IF NOT EXISTS idx_characters_owner ON characters(owner_id);
+-- webhook URL configured per channel with /setwebhook
+CREATE TABLE IF NOT EXISTS channel_webhooks (
+  channel_id INTEGER PRIMARY KEY,
+  url        TEXT NOT NULL
+);
+
+-- small key/value store for bot bookkeeping (e.g. the last synced command-tree hash)
+CREATE TABLE IF NOT EXISTS bot_meta (
+  key   TEXT PRIMARY KEY,
+  value TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_review_messages_char ON review_messages(guild_id, char_id);
+"""
+
+# Indexes follow the access paths in DB (python -m utils.query_plans checks them):
+#   list_pending / list_unposted_pending  -> guild_id, status='pending', ORDER BY submitted_at, id
+#   list_my_characters                    -> guild_id, owner_id, ORDER BY id DESC
+#   list_proxies                          -> approved characters with a proxy trigger
+INDEX_MIGRATION_SQL = """
+DROP INDEX IF EXISTS idx_characters_guild_status;
+DROP INDEX IF EXISTS idx_characters_owner;
+CREATE INDEX IF NOT EXISTS idx_characters_guild_status_submitted ON characters(guild_id, status, submitted_at, id);
+CREATE INDEX IF NOT EXISTS idx_characters_guild_owner ON characters(guild_id, owner_id, id);
+CREATE INDEX IF NOT EXISTS idx_characters_proxies ON characters(guild_id, owner_id)
+  WHERE status = 'approved' AND tupper_id IS NOT NULL;
 """
 # ---------- END SQL ----------
 
@@ -62,224 +109,1276 @@ DEFAULT_FORM = [
     {"key": "occupation",  "label": "Occupation",  "style": "short",     "required": True,  "max_length": 100},
 ]
 
+# ---------- migrations ----------
+# Ordered schema steps gated on PRAGMA user_version. Each step runs in a transaction that also
+# bumps user_version, so an up-to-date database costs one PRAGMA read at boot. Chunked steps
+# (backfills) return True while work remains; every chunk commits on its own, so an interrupted
+# step resumes from its remaining work on the next boot. An index build is a single statement
+# and cannot be chunked, so give it a step of its own.
+_MIGRATIONS: dict[int, tuple[str, object, bool]] = {}
+
+def migration(version: int, description: str, *, chunked: bool = False):
+    """Register `async fn(db)` as schema step `version`."""
+    def register(step):
+        if version in _MIGRATIONS:
+            raise ValueError(f"duplicate migration version {version}")
+        _MIGRATIONS[version] = (description, step, chunked)
+        return step
+    return register
+
+def sql_migration(version: int, description: str, script: str):
+    """Register a SQL script as schema step `version` (statements run one by one, inside the step's transaction)."""
+    statements = _split_sql(script)
+
+    async def step(db):
+        for stmt in statements:
+            await db.execute(stmt)
+    migration(version, description)(step)
+
+def _split_sql(script: str) -> list[str]:
+    # executescript() would COMMIT our transaction, so split on complete statements
+    # (sqlite3.complete_statement understands trigger bodies containing ';')
+    statements, buf = [], ""
+    for line in script.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            if buf.strip():
+                statements.append(buf.strip())
+            buf = ""
+    if buf.strip():
+        statements.append(buf.strip())
+    return statements
+
+async def _migrate(db: aiosqlite.Connection) -> int:
+    current = (await db.execute_fetchall("PRAGMA user_version"))[0][0]
+    for version in sorted(v for v in _MIGRATIONS if v > current):
+        description, step, chunked = _MIGRATIONS[version]
+        started = time.perf_counter()
+        more = True
+        while more:
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                more = bool(await step(db)) and chunked
+                if not more:
+                    await db.execute(f"PRAGMA user_version = {version}")
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+        print(f"[DB] Migration {version} applied: {description} ({time.perf_counter() - started:.2f}s)")
+        current = version
+    return current
+
+sql_migration(1, "base schema", INIT_SQL)
+
+@migration(2, "characters.extra_json")
+async def _add_extra_json(db):
+    # Databases created before extra_json existed; newer ones get it here too
+    cols = {row["name"] for row in await db.execute_fetchall("PRAGMA table_info(characters)")}
+    if "extra_json" not in cols:
+        await db.execute("ALTER TABLE characters ADD COLUMN extra_json TEXT")
+
+sql_migration(3, "indexes for the DB access paths", INDEX_MIGRATION_SQL)
+
+# Custom form answers, one row per (character, field) in form order, so they can be
+# filtered with an index and rendered without decoding extra_json.
+sql_migration(4, "character_fields", """
+CREATE TABLE IF NOT EXISTS character_fields (
+  char_id  INTEGER NOT NULL,
+  position INTEGER NOT NULL,
+  guild_id INTEGER NOT NULL,
+  key      TEXT NOT NULL,
+  value    TEXT NOT NULL COLLATE NOCASE,
+  PRIMARY KEY (char_id, position)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_character_fields_lookup ON character_fields(guild_id, key, value);
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_delete_fields AFTER DELETE ON characters BEGIN
+  DELETE FROM character_fields WHERE char_id = old.id;
+END;
+""")
+
+BACKFILL_CHUNK = 500
+
+@migration(5, "backfill character_fields from extra_json", chunked=True)
+async def _backfill_character_fields(db):
+    # Progress is kept in bot_meta inside each chunk's transaction, so a restart resumes after the last chunk
+    rows = await db.execute_fetchall("SELECT value FROM bot_meta WHERE key='backfill_character_fields'")
+    last_id = int(rows[0]["value"]) if rows else 0
+    chars = await db.execute_fetchall(
+        "SELECT id, guild_id, extra_json FROM characters WHERE id > ? ORDER BY id LIMIT ?",
+        (last_id, BACKFILL_CHUNK),
+    )
+    for row in chars:
+        try:
+            extra = json.loads(row["extra_json"]) if row["extra_json"] else {}
+        except ValueError:
+            extra = {}
+        await db.executemany(
+            "INSERT OR REPLACE INTO character_fields(char_id, position, guild_id, key, value) VALUES (?,?,?,?,?)",
+            _field_rows(row["id"], row["guild_id"], extra),
+        )
+    if len(chars) < BACKFILL_CHUNK:
+        await db.execute("DELETE FROM bot_meta WHERE key='backfill_character_fields'")
+        return False
+    await db.execute(
+        "INSERT OR REPLACE INTO bot_meta(key, value) VALUES ('backfill_character_fields', ?)",
+        (str(chars[-1]["id"]),),
+    )
+    return True
+
+def _field_rows(char_id: int, guild_id: int, extra: dict) -> list[tuple]:
+    return [(char_id, i, guild_id, str(k), str(v)) for i, (k, v) in enumerate(extra.items()) if v]
+
+# Full-text index over name, bio and form answers. Contentless (content=''), so it stores only
+# the index; the triggers rebuild each row's text from characters, and a delete has to pass the
+# exact text that was indexed. `guild` holds "g<guild_id>" so a search matches inside one guild
+# instead of filtering every guild's hits. Column weights for bm25 are set once as the rank.
+def _fts_values(ref: str) -> str:
+    answers = (f"coalesce((SELECT group_concat(value, ' ') FROM json_each("
+               f"CASE WHEN json_valid({ref}.extra_json) THEN {ref}.extra_json ELSE '{{}}' END)), '')")
+    return f"{ref}.id, {ref}.name, coalesce({ref}.bio, ''), {answers}, 'g' || {ref}.guild_id"
+
+sql_migration(6, "characters_fts", f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS characters_fts USING fts5(
+  name, bio, answers, guild, content='', tokenize='unicode61 remove_diacritics 2'
+);
+
+INSERT INTO characters_fts(characters_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 3.0, 0.0)');
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_fts_insert AFTER INSERT ON characters BEGIN
+  INSERT INTO characters_fts(rowid, name, bio, answers, guild) VALUES ({_fts_values("new")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_fts_delete AFTER DELETE ON characters BEGIN
+  INSERT INTO characters_fts(characters_fts, rowid, name, bio, answers, guild) VALUES ('delete', {_fts_values("old")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_fts_update AFTER UPDATE OF name, bio, extra_json ON characters BEGIN
+  INSERT INTO characters_fts(characters_fts, rowid, name, bio, answers, guild) VALUES ('delete', {_fts_values("old")});
+  INSERT INTO characters_fts(rowid, name, bio, answers, guild) VALUES ({_fts_values("new")});
+END;
+""")
+
+@migration(7, "index existing characters in characters_fts", chunked=True)
+async def _backfill_characters_fts(db):
+    # Rows inserted after step 6 are indexed by the trigger; this covers the ones before it
+    rows = await db.execute_fetchall("SELECT value FROM bot_meta WHERE key='backfill_characters_fts'")
+    last_id = int(rows[0]["value"]) if rows else 0
+    chars = await db.execute_fetchall(
+        "SELECT id FROM characters WHERE id > ? ORDER BY id LIMIT ?", (last_id, BACKFILL_CHUNK)
+    )
+    if chars:
+        await db.execute(
+            f"""
+            INSERT INTO characters_fts(rowid, name, bio, answers, guild)
+            SELECT {_fts_values("c")} FROM characters c WHERE c.id > ? AND c.id <= ?
+            """,
+            (last_id, chars[-1]["id"]),
+        )
+    if len(chars) < BACKFILL_CHUNK:
+        await db.execute("DELETE FROM bot_meta WHERE key='backfill_characters_fts'")
+        return False
+    await db.execute(
+        "INSERT OR REPLACE INTO bot_meta(key, value) VALUES ('backfill_characters_fts', ?)",
+        (str(chars[-1]["id"]),),
+    )
+    return True
+
+# Outbox of DMs to send (utils/notifications.py drains it). Rows are written in the same
+# transaction as the change they announce; next_attempt_at is a unix time.
+sql_migration(8, "notifications outbox", """
+CREATE TABLE IF NOT EXISTS notifications (
+  id              INTEGER PRIMARY KEY,
+  guild_id        INTEGER NOT NULL,
+  user_id         INTEGER NOT NULL,
+  kind            TEXT NOT NULL,
+  payload_json    TEXT NOT NULL,
+  attempts        INTEGER NOT NULL DEFAULT 0,
+  next_attempt_at REAL NOT NULL,
+  created_at      TEXT DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_notifications_due ON notifications(next_attempt_at);
+
+-- channel that gets an @mention when a member's DMs are closed
+ALTER TABLE guild_settings ADD COLUMN notify_channel_id INTEGER;
+""")
+
+# Bumped by every UPDATE of a character (in the statement itself, so RETURNING sees the new
+# value); (id, version) keys the rendered-embed cache in cogs/characters.py.
+sql_migration(9, "characters.version", """
+ALTER TABLE characters ADD COLUMN version INTEGER NOT NULL DEFAULT 0;
+""")
+
+# ---------- guild statistics ----------
+# /stats reads these instead of aggregating characters. Triggers keep them current:
+#   guild_stats           characters per status (current state)
+#   guild_reviewer_stats  decisions made per reviewer (history; unlinking doesn't undo them)
+#   guild_decision_hist   time from submission to decision, bucketed by DECISION_BUCKETS
+# Upper bounds (seconds) of the decision-time buckets; one more bucket holds everything slower.
+DECISION_BUCKETS = (60, 300, 900, 1800, 3600, 7200, 14400, 28800, 43200,
+                    86400, 172800, 259200, 604800, 1209600, 2592000)
+
+def _bucket_sql(seconds: str) -> str:
+    cases = " ".join(f"WHEN {seconds} < {bound} THEN {i}" for i, bound in enumerate(DECISION_BUCKETS))
+    return f"CASE {cases} ELSE {len(DECISION_BUCKETS)} END"
+
+_STATUS_COUNTS = "(new.status = 'pending'), (new.status = 'approved'), (new.status = 'rejected')"
+_BUMP_GUILD_STATS = f"""
+  INSERT INTO guild_stats(guild_id, pending, approved, rejected) VALUES (new.guild_id, {_STATUS_COUNTS})
+  ON CONFLICT(guild_id) DO UPDATE SET pending = pending + excluded.pending,
+    approved = approved + excluded.approved, rejected = rejected + excluded.rejected;"""
+_DROP_GUILD_STATS = """
+  UPDATE guild_stats SET pending = pending - (old.status = 'pending'),
+    approved = approved - (old.status = 'approved'), rejected = rejected - (old.status = 'rejected')
+  WHERE guild_id = old.guild_id;"""
+
+# When a character was approved/rejected (NULL while pending); feeds guild_decision_hist
+sql_migration(10, "characters.decided_at", """
+ALTER TABLE characters ADD COLUMN decided_at TEXT;
+""")
+
+sql_migration(11, "guild statistics counters", f"""
+CREATE TABLE IF NOT EXISTS guild_stats (
+  guild_id INTEGER PRIMARY KEY,
+  pending  INTEGER NOT NULL DEFAULT 0,
+  approved INTEGER NOT NULL DEFAULT 0,
+  rejected INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS guild_reviewer_stats (
+  guild_id    INTEGER NOT NULL,
+  reviewer_id INTEGER NOT NULL,
+  approved    INTEGER NOT NULL DEFAULT 0,
+  rejected    INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (guild_id, reviewer_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS guild_decision_hist (
+  guild_id INTEGER NOT NULL,
+  bucket   INTEGER NOT NULL,
+  n        INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (guild_id, bucket)
+) WITHOUT ROWID;
+
+-- one-time backfill from existing rows (older decisions have no decided_at, so no histogram)
+INSERT OR REPLACE INTO guild_stats(guild_id, pending, approved, rejected)
+SELECT guild_id, SUM(status = 'pending'), SUM(status = 'approved'), SUM(status = 'rejected')
+FROM characters GROUP BY guild_id;
+
+INSERT OR REPLACE INTO guild_reviewer_stats(guild_id, reviewer_id, approved, rejected)
+SELECT guild_id, reviewed_by, SUM(status = 'approved'), SUM(status = 'rejected')
+FROM characters WHERE reviewed_by IS NOT NULL AND status IN ('approved', 'rejected')
+GROUP BY guild_id, reviewed_by;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_stats_insert AFTER INSERT ON characters BEGIN{_BUMP_GUILD_STATS}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_stats_delete AFTER DELETE ON characters BEGIN{_DROP_GUILD_STATS}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_stats_status AFTER UPDATE OF status ON characters
+WHEN old.status IS NOT new.status BEGIN{_DROP_GUILD_STATS}{_BUMP_GUILD_STATS}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_stats_decision AFTER UPDATE OF status ON characters
+WHEN old.status IS NOT new.status AND new.status IN ('approved', 'rejected') BEGIN
+  INSERT INTO guild_reviewer_stats(guild_id, reviewer_id, approved, rejected)
+  SELECT new.guild_id, new.reviewed_by, (new.status = 'approved'), (new.status = 'rejected')
+  WHERE new.reviewed_by IS NOT NULL
+  ON CONFLICT(guild_id, reviewer_id) DO UPDATE SET
+    approved = approved + excluded.approved, rejected = rejected + excluded.rejected;
+  INSERT INTO guild_decision_hist(guild_id, bucket, n)
+  SELECT new.guild_id, {_bucket_sql("(julianday(new.decided_at) - julianday(new.submitted_at)) * 86400")}, 1
+  WHERE old.status = 'pending' AND new.decided_at IS NOT NULL AND new.submitted_at IS NOT NULL
+  ON CONFLICT(guild_id, bucket) DO UPDATE SET n = n + 1;
+END;
+""")
+
+# Imported characters arrive already decided (DB.import_characters); count their decisions too.
+# The history counters only see decisions through UPDATE otherwise.
+sql_migration(12, "guild statistics for characters inserted already decided", f"""
+CREATE TRIGGER IF NOT EXISTS trg_characters_stats_insert_decided AFTER INSERT ON characters
+WHEN new.status IN ('approved', 'rejected') BEGIN
+  INSERT INTO guild_reviewer_stats(guild_id, reviewer_id, approved, rejected)
+  SELECT new.guild_id, new.reviewed_by, (new.status = 'approved'), (new.status = 'rejected')
+  WHERE new.reviewed_by IS NOT NULL
+  ON CONFLICT(guild_id, reviewer_id) DO UPDATE SET
+    approved = approved + excluded.approved, rejected = rejected + excluded.rejected;
+  INSERT INTO guild_decision_hist(guild_id, bucket, n)
+  SELECT new.guild_id, {_bucket_sql("(julianday(new.decided_at) - julianday(new.submitted_at)) * 86400")}, 1
+  WHERE new.decided_at IS NOT NULL AND new.submitted_at IS NOT NULL
+  ON CONFLICT(guild_id, bucket) DO UPDATE SET n = n + 1;
+END;
+""")
+
+# Set by DB.import_characters. Imported pending characters have no review message on purpose
+# (reviewers decide them with /apps_bulk), so startup reconciliation doesn't re-post them.
+sql_migration(13, "characters.imported_at", """
+ALTER TABLE characters ADD COLUMN imported_at TEXT;
+""")
+
+# DB.import_characters looks up each incoming (owner, name) to skip characters it already imported
+sql_migration(14, "index for import dedup", """
+CREATE INDEX IF NOT EXISTS idx_characters_guild_owner_name ON characters(guild_id, owner_id, name);
+""")
+
+def _median_from_buckets(counts: dict[int, int]) -> Optional[float]:
+    # Walk the buckets to the one holding the middle decision and interpolate linearly inside it;
+    # the open-ended last bucket reports its lower bound.
+    total = sum(counts.values())
+    if not total:
+        return None
+    half, seen = total / 2, 0
+    for bucket in range(len(DECISION_BUCKETS) + 1):
+        n = counts.get(bucket, 0)
+        low = DECISION_BUCKETS[bucket - 1] if bucket else 0
+        if n and seen + n >= half:
+            if bucket == len(DECISION_BUCKETS):
+                return float(low)
+            return low + (DECISION_BUCKETS[bucket] - low) * (half - seen) / n
+        seen += n
+    return None
+
+# Larger than any rowid; the starting cursor for newest-first keyset pagination
+MAX_ROWID = 2**63 - 1
+
+# Characters per cursor fetch when streaming a guild out (DB.iter_guild_characters)
+EXPORT_BATCH = 500
+# Columns DB.import_characters takes from an export, besides the answers in `fields`
+IMPORT_COLUMNS = ("owner_id", "name", "bio", "avatar_url", "tupper_name", "tupper_id", "status",
+                  "submitted_at", "reviewed_by", "decision_reason", "decided_at")
+
+# Words of a /search query; everything else (FTS5 operators, quotes) is dropped
+_FTS_WORD = re.compile(r"\w+")
+
 # guards so init runs exactly once even if called multiple times
 _init_lock = asyncio.Lock()
 _initialized = False
 
-class DB:
-    @staticmethod
-    def connect():
-        # aiosqlite connection is an async context manager
-        return aiosqlite.connect(DB_PATH)
 
+class _Pool:
+    """Long-lived connections owned by DB.init(): a single writer and a queue of readers."""
+
+    def __init__(self, writer: aiosqlite.Connection, readers: list[aiosqlite.Connection]):
+        self.writer = writer
+        self.readers = readers
+        self.idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for conn in readers:
+            self.idle.put_nowait(conn)
+        # (op, future) pairs for the writer task; None tells it to stop
+        self.writes: asyncio.Queue = asyncio.Queue()
+        self.closing = False
+        self.stats = {"batches": 0, "writes": 0, "failed": 0, "max_batch": 0,
+                      "commit_seconds": 0.0, "last_commit_ms": 0.0}
+        self.write_task = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self.writes.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + WRITE_BATCH_WINDOW
+            while len(batch) < WRITE_BATCH_MAX:
+                try:
+                    item = self.writes.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.writes.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._apply(batch)
+
+    async def _apply(self, batch: list):
+        """Run a batch of mutations in one transaction; each op gets a savepoint so one failure
+        only rolls back that op. Futures resolve after COMMIT."""
+        db = self.writer
+        started = time.perf_counter()
+        done = []
+        try:
+            await db.execute("BEGIN IMMEDIATE")
+            for op, fut in batch:
+                await db.execute("SAVEPOINT op")
+                try:
+                    result = await op(db)
+                except Exception as e:
+                    await db.execute("ROLLBACK TO op")
+                    await db.execute("RELEASE op")
+                    self.stats["failed"] += 1
+                    if not fut.done():
+                        fut.set_exception(e)
+                else:
+                    await db.execute("RELEASE op")
+                    done.append((fut, result))
+            await db.commit()
+        except Exception as e:
+            print(f"[DB] Write batch of {len(batch)} failed: {e!r}")
+            try:
+                if db.in_transaction:
+                    await db.rollback()
+            except Exception:
+                pass
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        elapsed = time.perf_counter() - started
+        self.stats["batches"] += 1
+        self.stats["writes"] += len(done)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+        self.stats["commit_seconds"] += elapsed
+        self.stats["last_commit_ms"] = elapsed * 1000
+        for fut, result in done:
+            if not fut.done():
+                fut.set_result(result)
+
+    async def close(self):
+        # Stop accepting writes, let the writer task flush what is already queued
+        self.closing = True
+        self.writes.put_nowait(None)
+        await self.write_task
+        for conn in [*self.readers, self.writer]:
+            try:
+                await conn.close()
+            except Exception as e:
+                print(f"[DB] Error closing connection: {e}")
+
+
+_pool: Optional[_Pool] = None
+
+# Read-through caches for guild_settings / guild_forms, keyed by guild id.
+# A None value caches "no row". Once warm, a guild missing from the dict has no row either.
+_settings_cache: dict[int, Optional[dict]] = {}
+_form_cache: dict[int, Optional[list[dict]]] = {}
+_caches_warm = False
+_cache_stats = {"hits": 0, "misses": 0}
+
+# Callbacks run after a character write commits: fn(event, row) with event one of
+# "created" | "updated" | "deleted" and row a dict. In-memory indexes hook in here.
+_character_listeners: list = []
+
+
+async def _open(read_only: bool = False) -> aiosqlite.Connection:
+    # isolation_level=None: no implicit BEGINs, the writer task issues its own transactions
+    conn = await aiosqlite.connect(DB_PATH, isolation_level=None, cached_statements=STATEMENT_CACHE_SIZE)
+    conn.row_factory = aiosqlite.Row
+    for pragma, value in PRAGMAS:
+        await conn.execute(f"PRAGMA {pragma} = {value}")
+    if read_only:
+        await conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+async def _queue_decision_notices(db: aiosqlite.Connection, rows):
+    """Outbox a "decision" DM to the owner of each decided character (inside the caller's transaction)."""
+    now = time.time()
+    await db.executemany(
+        "INSERT INTO notifications(guild_id, user_id, kind, payload_json, next_attempt_at) VALUES (?,?,?,?,?)",
+        [(c.guild_id, c.owner_id, "decision",
+          json.dumps({"char_id": c.id, "name": c.name, "status": c.status, "reason": c.decision_reason},
+                     ensure_ascii=False), now)
+         for c in rows],
+    )
+
+
+async def _fetch_characters(db: aiosqlite.Connection, sql: str, params=(), *, with_fields: bool = True) -> list[Character]:
+    """Run a `SELECT *`/`RETURNING *` over characters and build Character objects straight from the cursor."""
+    async with db.execute(sql, params) as cursor:
+        cursor.row_factory = Character.from_row
+        chars = await cursor.fetchall()
+    if with_fields:
+        await _attach_fields(db, chars)
+    return chars
+
+
+async def _attach_fields(db: aiosqlite.Connection, chars: list[Character]):
+    """Fill each Character's `fields` (form order) from character_fields, in one query."""
+    if not chars:
+        return
+    by_id = {c.id: c for c in chars}
+    marks = ",".join("?" * len(by_id))
+    fields = await db.execute_fetchall(
+        f"SELECT char_id, key, value FROM character_fields WHERE char_id IN ({marks}) ORDER BY char_id, position",
+        list(by_id),
+    )
+    for f in fields:
+        by_id[f["char_id"]].fields[f["key"]] = f["value"]
+
+
+class DB:
     @staticmethod
     async def init():
-        """Create schema and run lightweight migrations once."""
-        global _initialized
+        """Apply pending migrations and open the connection pool once."""
+        global _initialized, _pool
         if _initialized:
             return
         async with _init_lock:
             if _initialized:
                 return
-            async with DB.connect() as db:
-                # Base schema
-                await db.executescript(INIT_SQL)
-                await db.commit()
-
-                # --- migration: ensure characters.extra_json exists ---
-                db.row_factory = aiosqlite.Row
-                cur = await db.execute("PRAGMA table_info(characters)")
-                cols = {row["name"] for row in await cur.fetchall()}
-                if "extra_json" not in cols:
-                    await db.execute("ALTER TABLE characters ADD COLUMN extra_json TEXT")
-                    await db.commit()
+            writer = await _open()
+            # journal_mode can't change inside a transaction; it is persistent, so this is a no-op after first boot
+            await writer.execute("PRAGMA journal_mode = WAL")
+            await _migrate(writer)
 
+            readers = [await _open(read_only=True) for _ in range(max(1, DB_READERS))]
+            _pool = _Pool(writer, readers)
             _initialized = True
 
+    @staticmethod
+    async def close():
+        """Close every pooled connection. Called from MyBot.close()."""
+        global _initialized, _pool, _caches_warm
+        async with _init_lock:
+            if _pool is not None:
+                await _pool.close()
+            _pool = None
+            _initialized = False
+            _caches_warm = False
+
+    @staticmethod
+    def _get_pool() -> _Pool:
+        if _pool is None:
+            raise RuntimeError("DB.init() has not been called.")
+        return _pool
+
+    @staticmethod
+    @asynccontextmanager
+    async def reader():
+        """Borrow a read-only pooled connection."""
+        pool = DB._get_pool()
+        conn = await pool.idle.get()
+        try:
+            yield conn
+        finally:
+            pool.idle.put_nowait(conn)
+
+    @staticmethod
+    async def _write(op):
+        """Queue `op(db)` for the writer task and wait for its batch to commit.
+        Returns whatever the op returned."""
+        pool = DB._get_pool()
+        if pool.closing:
+            raise RuntimeError("DB is shutting down.")
+        fut = asyncio.get_running_loop().create_future()
+        pool.writes.put_nowait((op, fut))
+        return await fut
+
+    @staticmethod
+    async def _execute_write(sql: str, params=()):
+        """Queue a single statement; returns its cursor (lastrowid/rowcount)."""
+        async def op(db):
+            return await db.execute(sql, params)
+        return await DB._write(op)
+
+    @staticmethod
+    def write_stats() -> dict:
+        """Counters for the group-commit writer (batch sizes, commit latency)."""
+        stats = dict(DB._get_pool().stats)
+        stats["avg_batch"] = stats["writes"] / stats["batches"] if stats["batches"] else 0.0
+        stats["avg_commit_ms"] = stats["commit_seconds"] * 1000 / stats["batches"] if stats["batches"] else 0.0
+        stats["queued"] = DB._get_pool().writes.qsize()
+        return stats
+
+    # -------- settings/form cache --------
+    @staticmethod
+    async def warm_caches():
+        """Load every guild's settings and form in one query each (called from setup_hook)."""
+        global _caches_warm
+        async with DB.reader() as db:
+            settings = await db.execute_fetchall("SELECT * FROM guild_settings")
+            forms = await db.execute_fetchall("SELECT guild_id, form_json FROM guild_forms")
+        _settings_cache.clear()
+        _settings_cache.update({row["guild_id"]: dict(row) for row in settings})
+        _form_cache.clear()
+        _form_cache.update({row["guild_id"]: json.loads(row["form_json"]) for row in forms})
+        _caches_warm = True
+
+    @staticmethod
+    def cache_stats() -> dict:
+        return {**_cache_stats, "settings": len(_settings_cache), "forms": len(_form_cache), "warm": _caches_warm}
+
+    # -------- change listeners --------
+    @staticmethod
+    def on_character_change(fn):
+        _character_listeners.append(fn)
+        return fn
+
+    @staticmethod
+    def off_character_change(fn):
+        if fn in _character_listeners:
+            _character_listeners.remove(fn)
+
+    @staticmethod
+    def _notify(event: str, row: Character):
+        for fn in _character_listeners:
+            try:
+                fn(event, row)
+            except Exception as e:
+                print(f"[DB] character listener {fn!r} failed on {event}: {e!r}")
+
+    # -------- bot meta --------
+    @staticmethod
+    async def get_meta(key: str) -> Optional[str]:
+        async with DB.reader() as db:
+            rows = await db.execute_fetchall("SELECT value FROM bot_meta WHERE key=?", (key,))
+            return rows[0]["value"] if rows else None
+
+    @staticmethod
+    async def set_meta(key: str, value: Optional[str]):
+        await DB._execute_write(
+            """
+            INSERT INTO bot_meta(key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+            """,
+            (key, value),
+        )
+
+    # -------- channel webhooks --------
+    @staticmethod
+    async def load_webhooks() -> dict[int, str]:
+        async with DB.reader() as db:
+            rows = await db.execute_fetchall("SELECT channel_id, url FROM channel_webhooks")
+            return {row["channel_id"]: row["url"] for row in rows}
+
+    @staticmethod
+    async def set_webhook(channel_id: int, url: Optional[str]):
+        if url is None:
+            await DB._execute_write("DELETE FROM channel_webhooks WHERE channel_id=?", (channel_id,))
+            return
+        await DB._execute_write(
+            """
+            INSERT INTO channel_webhooks(channel_id, url) VALUES (?, ?)
+            ON CONFLICT(channel_id) DO UPDATE SET url=excluded.url
+            """,
+            (channel_id, url),
+        )
+
+    @staticmethod
+    async def import_webhooks(urls: dict[int, str]):
+        """Bulk insert; existing rows win over imported ones."""
+        async def op(db):
+            await db.executemany("INSERT OR IGNORE INTO channel_webhooks(channel_id, url) VALUES (?, ?)",
+                                 list(urls.items()))
+        await DB._write(op)
+
     # -------- guild settings --------
     @staticmethod
-    async def get_settings(guild_id: int):
-        async with DB.connect() as db:
-            db.row_factory = aiosqlite.Row
-            cur = await db.execute("SELECT * FROM guild_settings WHERE guild_id=?", (guild_id,))
-            return await cur.fetchone()
+    async def get_settings(guild_id: int) -> Optional[dict]:
+        if guild_id in _settings_cache or _caches_warm:
+            _cache_stats["hits"] += 1
+            return _settings_cache.get(guild_id)
+        _cache_stats["misses"] += 1
+        async with DB.reader() as db:
+            rows = await db.execute_fetchall("SELECT * FROM guild_settings WHERE guild_id=?", (guild_id,))
+        _settings_cache[guild_id] = dict(rows[0]) if rows else None
+        return _settings_cache[guild_id]
+
+    @staticmethod
+    async def _upsert_settings(sql: str, params):
+        # Write-through: the upsert RETURNs the full row, which replaces the cached copy
+        async def op(db):
+            rows = await db.execute_fetchall(sql, params)
+            return dict(rows[0])
+        row = await DB._write(op)
+        _settings_cache[row["guild_id"]] = row
 
     @staticmethod
     async def set_review_channel(guild_id: int, channel_id: Optional[int]):
-        async with DB.connect() as db:
-            await db.execute(
-                """
-                INSERT INTO guild_settings(guild_id, review_channel_id)
-                VALUES (?, ?)
-                ON CONFLICT(guild_id) DO UPDATE SET review_channel_id=excluded.review_channel_id
-                """,
-                (guild_id, channel_id),
-            )
-            await db.commit()
+        await DB._upsert_settings(
+            """
+            INSERT INTO guild_settings(guild_id, review_channel_id)
+            VALUES (?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET review_channel_id=excluded.review_channel_id
+            RETURNING *
+            """,
+            (guild_id, channel_id),
+        )
 
     @staticmethod
     async def set_reviewer_role(guild_id: int, role_id: Optional[int]):
-        async with DB.connect() as db:
-            await db.execute(
-                """
-                INSERT INTO guild_settings(guild_id, reviewer_role_id)
-                VALUES (?, ?)
-                ON CONFLICT(guild_id) DO UPDATE SET reviewer_role_id=excluded.reviewer_role_id
-                """,
-                (guild_id, role_id),
+        await DB._upsert_settings(
+            """
+            INSERT INTO guild_settings(guild_id, reviewer_role_id)
+            VALUES (?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET reviewer_role_id=excluded.reviewer_role_id
+            RETURNING *
+            """,
+            (guild_id, role_id),
+        )
+
+    @staticmethod
+    async def set_notify_channel(guild_id: int, channel_id: Optional[int]):
+        await DB._upsert_settings(
+            """
+            INSERT INTO guild_settings(guild_id, notify_channel_id)
+            VALUES (?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET notify_channel_id=excluded.notify_channel_id
+            RETURNING *
+            """,
+            (guild_id, channel_id),
+        )
+
+    # -------- notifications outbox --------
+    @staticmethod
+    async def due_notifications(now: float, limit: int = 50):
+        """Outbox rows whose next attempt is due, oldest first."""
+        async with DB.reader() as db:
+            return await db.execute_fetchall(
+                "SELECT * FROM notifications WHERE next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (now, limit),
             )
-            await db.commit()
+
+    @staticmethod
+    async def next_notification_at() -> Optional[float]:
+        async with DB.reader() as db:
+            rows = await db.execute_fetchall("SELECT MIN(next_attempt_at) FROM notifications")
+        return rows[0][0]
+
+    @staticmethod
+    async def finish_notification(notification_id: int):
+        await DB._execute_write("DELETE FROM notifications WHERE id=?", (notification_id,))
+
+    @staticmethod
+    async def retry_notification(notification_id: int, next_attempt_at: float):
+        await DB._execute_write(
+            "UPDATE notifications SET attempts=attempts+1, next_attempt_at=? WHERE id=?",
+            (next_attempt_at, notification_id),
+        )
 
     # -------- guild forms --------
     @staticmethod
     async def get_form(guild_id: int):
-        async with DB.connect() as db:
-            db.row_factory = aiosqlite.Row
-            cur = await db.execute("SELECT form_json FROM guild_forms WHERE guild_id=?", (guild_id,))
-            row = await cur.fetchone()
-            return json.loads(row["form_json"]) if row else DEFAULT_FORM
+        if guild_id in _form_cache or _caches_warm:
+            _cache_stats["hits"] += 1
+            return _form_cache.get(guild_id) or DEFAULT_FORM
+        _cache_stats["misses"] += 1
+        async with DB.reader() as db:
+            rows = await db.execute_fetchall("SELECT form_json FROM guild_forms WHERE guild_id=?", (guild_id,))
+        _form_cache[guild_id] = json.loads(rows[0]["form_json"]) if rows else None
+        return _form_cache[guild_id] or DEFAULT_FORM
 
     @staticmethod
     async def set_form(guild_id: int, form: list[dict]):
-        async with DB.connect() as db:
-            data = json.dumps(form, ensure_ascii=False)
-            await db.execute(
-                """
-                INSERT INTO guild_forms(guild_id, form_json)
-                VALUES (?, ?)
-                ON CONFLICT(guild_id) DO UPDATE SET form_json=excluded.form_json
-                """,
-                (guild_id, data),
-            )
-            await db.commit()
+        data = json.dumps(form, ensure_ascii=False)
+        await DB._execute_write(
+            """
+            INSERT INTO guild_forms(guild_id, form_json)
+            VALUES (?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET form_json=excluded.form_json
+            """,
+            (guild_id, data),
+        )
+        _form_cache[guild_id] = json.loads(data)
 
     @staticmethod
     async def save_review_message(guild_id: int, channel_id: int, message_id: int, char_id: int):
-      async with DB.connect() as db:
-        await db.execute("""
+        await DB._execute_write("""
             INSERT OR REPLACE INTO review_messages(guild_id, channel_id, message_id, char_id)
             VALUES (?, ?, ?, ?)
         """, (guild_id, channel_id, message_id, char_id))
-        await db.commit()
 
     @staticmethod
     async def delete_review_message(guild_id: int, message_id: int):
-      async with DB.connect() as db:
-        await db.execute("DELETE FROM review_messages WHERE guild_id=? AND message_id=?",
-                         (guild_id, message_id))
-        await db.commit()
+        await DB._execute_write("DELETE FROM review_messages WHERE guild_id=? AND message_id=?",
+                                (guild_id, message_id))
 
     @staticmethod
     async def list_pending_review_messages(guild_id: int):
-        async with DB.connect() as db:
-            db.row_factory = aiosqlite.Row
-            cur = await db.execute("SELECT * FROM review_messages WHERE guild_id=?", (guild_id,))
-            return await cur.fetchall()
+        async with DB.reader() as db:
+            return await db.execute_fetchall("SELECT * FROM review_messages WHERE guild_id=?", (guild_id,))
+
+    @staticmethod
+    async def delete_review_messages(guild_id: int, message_ids: list[int]):
+        async def op(db):
+            await db.executemany("DELETE FROM review_messages WHERE guild_id=? AND message_id=?",
+                                 [(guild_id, mid) for mid in message_ids])
+        await DB._write(op)
 
     @staticmethod
     async def list_review_messages(guild_id: int):
         """
-        Returns a list of dicts: {channel_id, message_id, char_id} for all review messages in the given guild.
+        Returns a list of dicts: {channel_id, message_id, char_id, status} for all review messages in the given guild.
+        status is the character's current status, or None if the character no longer exists.
         """
         results = []
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute("SELECT channel_id, message_id, char_id FROM review_messages WHERE guild_id = ?", (guild_id,)) as cursor:
+        async with DB.reader() as db:
+            async with db.execute(
+                """
+                SELECT rm.channel_id, rm.message_id, rm.char_id, c.status
+                FROM review_messages rm
+                LEFT JOIN characters c ON c.id = rm.char_id AND c.guild_id = rm.guild_id
+                WHERE rm.guild_id = ?
+                """,
+                (guild_id,),
+            ) as cursor:
                 async for row in cursor:
                     results.append({
                         'channel_id': row[0],
                         'message_id': row[1],
                         'char_id': row[2],
+                        'status': row[3],
                     })
         return results
 
+    @staticmethod
+    async def list_unposted_pending(guild_id: int):
+        """Pending characters in the guild that have no review message (imported ones never get one)."""
+        async with DB.reader() as db:
+            return await _fetch_characters(
+                db,
+                """
+                SELECT c.* FROM characters c
+                WHERE c.guild_id=? AND c.status='pending' AND c.imported_at IS NULL
+                  AND NOT EXISTS (
+                    SELECT 1 FROM review_messages rm WHERE rm.guild_id = c.guild_id AND rm.char_id = c.id
+                  )
+                ORDER BY c.submitted_at ASC
+                """,
+                (guild_id,),
+            )
+
     # -------- characters --------
     @staticmethod
     async def create_character(
         guild_id: int,
         owner_id: int,
         name: str,
-        extra_json: Optional[str],  # Age/Face Claim/Occupation and other custom fields go here
-    ) -> int:
-        async with DB.connect() as db:
+        extra: Optional[dict],  # Age/Face Claim/Occupation and other custom form answers
+    ) -> Character:
+        """Insert a pending character (plus its character_fields) and return it."""
+        extra = {k: v for k, v in (extra or {}).items() if v}
+        extra_json = json.dumps(extra, ensure_ascii=False) if extra else None
+
+        async def op(db):
             await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES (?);", (owner_id,))
-            cur = await db.execute(
+            chars = await _fetch_characters(
+                db,
                 """
                 INSERT INTO characters(guild_id, owner_id, name, extra_json)
                 VALUES (?,?,?,?)
+                RETURNING *
                 """,
                 (guild_id, owner_id, name, extra_json),
+                with_fields=False,
+            )
+            char = chars[0]
+            await db.executemany(
+                "INSERT INTO character_fields(char_id, position, guild_id, key, value) VALUES (?,?,?,?,?)",
+                _field_rows(char.id, guild_id, extra),
+            )
+            char.fields = extra
+            return char
+        row = await DB._write(op)
+        DB._notify("created", row)
+        return row
+
+    @staticmethod
+    async def import_characters(guild_id: int, chars: list[dict]) -> list[Character]:
+        """
+        Insert one chunk of exported characters (dicts with IMPORT_COLUMNS and `fields`) into the
+        guild with executemany in a single transaction, keeping their status, review and proxy data.
+        A character already in the guild with the same owner, name and submitted_at is skipped, so
+        re-running an interrupted import doesn't duplicate the chunks that were committed. Records
+        without submitted_at get the import time (a NULL would hide them from list_pending and
+        decide_many) and are skipped if the owner already has a character with that name.
+        Rows are stamped with imported_at; pending ones get no review message (see migration 13).
+        Returns the characters that were inserted.
+        """
+        async def op(db):
+            owners = sorted({c["owner_id"] for c in chars})
+            # Only this chunk's (owner, name) pairs are looked up, so a chunk costs the same however
+            # much of the guild is already there
+            pairs = sorted({(c["owner_id"], c["name"]) for c in chars})
+            seen = {tuple(r) for r in await db.execute_fetchall(
+                """
+                SELECT c.owner_id, c.name, c.submitted_at
+                FROM json_each(?) k
+                CROSS JOIN characters c
+                  ON c.guild_id=? AND c.owner_id=json_extract(k.value, '$[0]') AND c.name=json_extract(k.value, '$[1]')
+                """,
+                (json.dumps(pairs), guild_id),
+            )}
+            named = {key[:2] for key in seen}
+            now = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())  # same format as datetime('now')
+            new = []
+            for c in chars:
+                if c["submitted_at"] is None:
+                    if (c["owner_id"], c["name"]) in named:
+                        continue
+                    c = {**c, "submitted_at": now}
+                key = (c["owner_id"], c["name"], c["submitted_at"])
+                if key not in seen:
+                    seen.add(key)
+                    named.add(key[:2])
+                    new.append(c)
+            if not new:
+                return []
+            await db.executemany("INSERT OR IGNORE INTO users(user_id) VALUES (?)", [(o,) for o in owners])
+            await db.executemany(
+                f"""
+                INSERT INTO characters(guild_id, {", ".join(IMPORT_COLUMNS)}, extra_json, imported_at)
+                VALUES (?, {", ".join("?" * len(IMPORT_COLUMNS))}, ?, ?)
+                """,
+                [(guild_id, *(c[col] for col in IMPORT_COLUMNS),
+                  json.dumps(c["fields"], ensure_ascii=False) if c["fields"] else None, now) for c in new],
+            )
+            # AUTOINCREMENT hands out consecutive ids and nothing else writes inside this op,
+            # so the chunk got the ids that end at last_insert_rowid()
+            last_id = (await db.execute_fetchall("SELECT last_insert_rowid()"))[0][0]
+            inserted = [
+                Character(id=last_id - len(new) + 1 + i, guild_id=guild_id,
+                          **{col: c[col] for col in IMPORT_COLUMNS}, imported_at=now, fields=c["fields"])
+                for i, c in enumerate(new)
+            ]
+            await db.executemany(
+                "INSERT INTO character_fields(char_id, position, guild_id, key, value) VALUES (?,?,?,?,?)",
+                [f for char in inserted for f in _field_rows(char.id, guild_id, char.fields)],
+            )
+            return inserted
+        rows = await DB._write(op)
+        for row in rows:
+            DB._notify("created", row)
+        return rows
+
+    @staticmethod
+    async def iter_guild_characters(guild_id: int, batch: int = EXPORT_BATCH):
+        """
+        Every character in the guild, with fields, in lists of up to `batch` fetched from one open
+        cursor, so an export holds one batch in memory instead of the whole guild. The cursor keeps
+        its pooled connection (and one consistent snapshot) until the iteration ends; use
+        contextlib.aclosing() so an abandoned export gives the connection back.
+        """
+        async with DB.reader() as db:
+            async with db.execute("SELECT * FROM characters WHERE guild_id=?", (guild_id,)) as cursor:
+                cursor.row_factory = Character.from_row
+                while chars := await cursor.fetchmany(batch):
+                    await _attach_fields(db, chars)
+                    yield chars
+
+    @staticmethod
+    async def get_character(guild_id: int, char_id: int) -> Optional[Character]:
+        async with DB.reader() as db:
+            chars = await _fetch_characters(db, "SELECT * FROM characters WHERE id=? AND guild_id=?", (char_id, guild_id))
+            return chars[0] if chars else None
+
+    @staticmethod
+    async def find_by_field(guild_id: int, key: str, value: str, limit: int = 25, after_id: int = 0):
+        """
+        Characters in the guild whose form answer `key` equals `value` (case-insensitive), via the
+        fields index, by id. Keyset pagination: pass the last id of a page as after_id.
+        """
+        async with DB.reader() as db:
+            return await db.execute_fetchall(
+                """
+                SELECT c.id, c.name, c.owner_id, c.status
+                FROM character_fields f
+                JOIN characters c ON c.id = f.char_id
+                WHERE f.guild_id=? AND f.key=? AND f.value=? AND f.char_id > ?
+                ORDER BY f.char_id
+                LIMIT ?
+                """,
+                (guild_id, key, value, after_id, limit),
+            )
+
+    @staticmethod
+    async def search_characters(guild_id: int, query: str, status: Optional[str] = None,
+                                owner_id: Optional[int] = None, limit: int = 10, offset: int = 0):
+        """
+        Full-text search over name, bio and form answers within a guild, best bm25 match first.
+        Every word of `query` must match the start of a word (prefix search). Rows are
+        (id, name, owner_id, status); page with limit/offset (the ranking has no stable keyset).
+        """
+        words = _FTS_WORD.findall(query)
+        if not words:
+            return []
+        match = f"guild:g{int(guild_id)} AND {{name bio answers}}:(" + " ".join(f'"{w}"*' for w in words) + ")"
+        filters, params = "", [match, guild_id]
+        if status:
+            filters += " AND c.status=?"
+            params.append(status)
+        if owner_id is not None:
+            filters += " AND c.owner_id=?"
+            params.append(owner_id)
+        async with DB.reader() as db:
+            return await db.execute_fetchall(
+                f"""
+                SELECT c.id, c.name, c.owner_id, c.status
+                FROM characters_fts
+                JOIN characters c ON c.id = characters_fts.rowid
+                WHERE characters_fts MATCH ? AND c.guild_id=?{filters}
+                ORDER BY characters_fts.rank
+                LIMIT ? OFFSET ?
+                """,
+                (*params, limit, offset),
+            )
+
+    @staticmethod
+    async def load_field_values(key: str):
+        """(char_id, guild_id, value, status) of every character with an answer for `key`, across all guilds."""
+        async with DB.reader() as db:
+            return await db.execute_fetchall(
+                """
+                SELECT f.char_id, f.guild_id, f.value, c.status
+                FROM character_fields f
+                JOIN characters c ON c.id = f.char_id
+                WHERE f.key=?
+                """,
+                (key,),
+            )
+
+    @staticmethod
+    async def list_guild_characters(guild_id: int):
+        """(id, owner_id, name, status) of every character in the guild, for the autocomplete index."""
+        async with DB.reader() as db:
+            return await db.execute_fetchall(
+                "SELECT id, owner_id, name, status FROM characters WHERE guild_id=?", (guild_id,)
             )
-            await db.commit()
-            return cur.lastrowid
 
     @staticmethod
-    async def get_character(guild_id: int, char_id: int):
-        async with DB.connect() as db:
-            db.row_factory = aiosqlite.Row
-            cur = await db.execute("SELECT * FROM characters WHERE id=? AND guild_id=?", (char_id, guild_id))
-            return await cur.fetchone()
+    async def get_guild_stats(guild_id: int) -> dict:
+        """
+        Totals for /stats, read from the trigger-maintained counter tables (primary-key lookups only):
+        pending/approved/rejected counts, reviewers as (reviewer_id, approved, rejected) with the
+        busiest first, the number of timed decisions and their median time-to-decision in seconds
+        (estimated within its DECISION_BUCKETS bucket; None until something has been decided).
+        """
+        async with DB.reader() as db:
+            totals = await db.execute_fetchall(
+                "SELECT pending, approved, rejected FROM guild_stats WHERE guild_id=?", (guild_id,)
+            )
+            reviewers = await db.execute_fetchall(
+                "SELECT reviewer_id, approved, rejected FROM guild_reviewer_stats WHERE guild_id=?", (guild_id,)
+            )
+            hist = await db.execute_fetchall(
+                "SELECT bucket, n FROM guild_decision_hist WHERE guild_id=?", (guild_id,)
+            )
+        stats = dict(totals[0]) if totals else {"pending": 0, "approved": 0, "rejected": 0}
+        stats["reviewers"] = sorted(
+            (tuple(r) for r in reviewers if r["approved"] or r["rejected"]),
+            key=lambda r: (-(r[1] + r[2]), r[0]),
+        )
+        counts = {r["bucket"]: r["n"] for r in hist}
+        stats["decisions"] = sum(counts.values())
+        stats["median_decision_seconds"] = _median_from_buckets(counts)
+        return stats
 
     @staticmethod
-    async def list_my_characters(guild_id: int, owner_id: int, only_status: Optional[str] = None):
-        async with DB.connect() as db:
-            db.row_factory = aiosqlite.Row
+    async def list_my_characters(guild_id: int, owner_id: int, only_status: Optional[str] = None,
+                                 before_id: Optional[int] = None, limit: int = 10):
+        """
+        One page of the owner's characters (id, name, status), newest first.
+        Keyset pagination: pass the last id of a page as before_id to get the next one.
+        """
+        before = before_id if before_id is not None else MAX_ROWID
+        async with DB.reader() as db:
             if only_status:
-                cur = await db.execute(
-                    """
-                    SELECT * FROM characters
-                    WHERE guild_id=? AND owner_id=? AND status=?
-                    ORDER BY id DESC
-                    """,
-                    (guild_id, owner_id, only_status),
-                )
-            else:
-                cur = await db.execute(
+                return await db.execute_fetchall(
                     """
-                    SELECT * FROM characters
-                    WHERE guild_id=? AND owner_id=?
+                    SELECT id, name, status FROM characters
+                    WHERE guild_id=? AND owner_id=? AND status=? AND id < ?
                     ORDER BY id DESC
+                    LIMIT ?
                     """,
-                    (guild_id, owner_id),
+                    (guild_id, owner_id, only_status, before, limit),
                 )
-            return await cur.fetchall()
+            return await db.execute_fetchall(
+                """
+                SELECT id, name, status FROM characters
+                WHERE guild_id=? AND owner_id=? AND id < ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (guild_id, owner_id, before, limit),
+            )
 
     @staticmethod
-    async def list_pending(guild_id: int, limit: int = 20):
-        async with DB.connect() as db:
-            db.row_factory = aiosqlite.Row
-            cur = await db.execute(
+    async def list_pending(guild_id: int, limit: int = 20, after: Optional[tuple[str, int]] = None):
+        """
+        One page of pending applications (id, name, owner_id, submitted_at), oldest first.
+        Keyset pagination: pass (submitted_at, id) of the last row of a page as `after`.
+        """
+        after_ts, after_id = after if after is not None else ("", 0)
+        async with DB.reader() as db:
+            return await db.execute_fetchall(
                 """
-                SELECT * FROM characters
-                WHERE guild_id=? AND status='pending'
-                ORDER BY submitted_at ASC
+                SELECT id, name, owner_id, submitted_at FROM characters
+                WHERE guild_id=? AND status='pending' AND (submitted_at, id) > (?, ?)
+                ORDER BY submitted_at ASC, id ASC
                 LIMIT ?
                 """,
-                (guild_id, limit),
+                (guild_id, after_ts, after_id, limit),
             )
-            return await cur.fetchall()
 
     @staticmethod
     async def set_status(guild_id: int, char_id: int, status: str, reviewer_id: int, reason: Optional[str]):
-        async with DB.connect() as db:
-            await db.execute(
+        async def op(db):
+            return await _fetch_characters(
+                db,
                 """
                 UPDATE characters
-                SET status=?, reviewed_by=?, decision_reason=?
+                SET status=?, reviewed_by=?, decision_reason=?, version=version+1,
+                    decided_at=CASE WHEN ?='pending' THEN NULL
+                                    WHEN status='pending' THEN datetime('now') ELSE decided_at END
                 WHERE id=? AND guild_id=?
+                RETURNING *
+                """,
+                (status, reviewer_id, reason, status, char_id, guild_id),
+            )
+        for row in await DB._write(op):
+            DB._notify("updated", row)
+
+    @staticmethod
+    async def decide(guild_id: int, char_id: int, status: str, reviewer_id: int,
+                     reason: Optional[str], message_id: Optional[int] = None):
+        """
+        Approve/reject a character in one transaction: the status only moves from 'pending',
+        the owner's DM is queued in the notifications outbox, and the review-message mapping
+        is removed either way.
+        Returns (row, decided). decided is False when another reviewer got there first
+        (row is then the current state) or the character no longer exists (row is None).
+        """
+        async def op(db):
+            rows = await _fetch_characters(
+                db,
+                """
+                UPDATE characters
+                SET status=?, reviewed_by=?, decision_reason=?, version=version+1, decided_at=datetime('now')
+                WHERE id=? AND guild_id=? AND status='pending'
+                RETURNING *
                 """,
                 (status, reviewer_id, reason, char_id, guild_id),
             )
-            await db.commit()
+            decided = bool(rows)
+            if decided:
+                await _queue_decision_notices(db, rows)
+            else:
+                rows = await _fetch_characters(db, "SELECT * FROM characters WHERE id=? AND guild_id=?", (char_id, guild_id))
+            if message_id is not None:
+                await db.execute("DELETE FROM review_messages WHERE guild_id=? AND message_id=?", (guild_id, message_id))
+            else:
+                await db.execute("DELETE FROM review_messages WHERE guild_id=? AND char_id=?", (guild_id, char_id))
+            return (rows[0] if rows else None), decided
+        row, decided = await DB._write(op)
+        if decided:
+            DB._notify("updated", row)
+        return row, decided
+
+    @staticmethod
+    async def decide_many(guild_id: int, status: str, reviewer_id: int, reason: Optional[str],
+                          char_ids: Optional[list[int]] = None, owner_id: Optional[int] = None,
+                          submitted_before: Optional[str] = None, limit: int = 500):
+        """
+        Approve/reject pending characters in one transaction: the given ids, or (char_ids=None)
+        every pending character matching the owner/submitted_before filters, up to `limit`.
+        Owner DMs are queued in the notifications outbox.
+        Returns (characters, review_messages, remaining): the decided characters,
+        {char_id: (channel_id, message_id)} for the review messages whose mapping was removed, and
+        how many matching characters are still pending because `limit` was reached.
+        """
+        where, params = "guild_id=? AND status='pending'", [guild_id]
+        if char_ids is not None:
+            where += " AND id IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(char_ids))
+        if owner_id is not None:
+            where += " AND owner_id=?"
+            params.append(owner_id)
+        if submitted_before is not None:
+            where += " AND submitted_at < ?"
+            params.append(submitted_before)
+
+        async def op(db):
+            rows = await _fetch_characters(
+                db,
+                f"""
+                UPDATE characters
+                SET status=?, reviewed_by=?, decision_reason=?, version=version+1, decided_at=datetime('now')
+                WHERE id IN (SELECT id FROM characters WHERE {where} ORDER BY submitted_at, id LIMIT ?)
+                RETURNING *
+                """,
+                (status, reviewer_id, reason, *params, limit),
+            )
+            if not rows:
+                return [], {}, 0
+            remaining = 0
+            if len(rows) == limit:
+                remaining = (await db.execute_fetchall(
+                    f"SELECT count(*) FROM characters WHERE {where}", params
+                ))[0][0]
+            await _queue_decision_notices(db, rows)
+            messages = await db.execute_fetchall(
+                """
+                DELETE FROM review_messages
+                WHERE guild_id=? AND char_id IN (SELECT value FROM json_each(?))
+                RETURNING char_id, channel_id, message_id
+                """,
+                (guild_id, json.dumps([c.id for c in rows])),
+            )
+            return rows, {m["char_id"]: (m["channel_id"], m["message_id"]) for m in messages}, remaining
+        rows, messages, remaining = await DB._write(op)
+        for row in rows:
+            DB._notify("updated", row)
+        return rows, messages, remaining
 
     @staticmethod
     async def unlink(guild_id: int, owner_id: int, char_id: int) -> bool:
-        async with DB.connect() as db:
-            cur = await db.execute(
+        async def op(db):
+            # character_fields rows go with the character (trigger), so the deleted event has no fields
+            return await _fetch_characters(
+                db,
                 """
                 DELETE FROM characters
                 WHERE id=? AND guild_id=? AND owner_id=?
+                RETURNING *
                 """,
                 (char_id, guild_id, owner_id),
+                with_fields=False,
+            )
+        rows = await DB._write(op)
+        for row in rows:
+            DB._notify("deleted", row)
+        return bool(rows)
+
+    # -------- proxying --------
+    @staticmethod
+    async def set_proxy(guild_id: int, owner_id: int, char_id: int,
+                        prefix: Optional[str], display_name: Optional[str] = None):
+        """Set (or clear, with prefix=None) a character's proxy trigger (tupper_id) and display name (tupper_name)."""
+        async def op(db):
+            chars = await _fetch_characters(
+                db,
+                """
+                UPDATE characters
+                SET tupper_id=?, tupper_name=?, version=version+1
+                WHERE id=? AND guild_id=? AND owner_id=?
+                RETURNING *
+                """,
+                (prefix, display_name, char_id, guild_id, owner_id),
+            )
+            return chars[0] if chars else None
+        row = await DB._write(op)
+        if row:
+            DB._notify("updated", row)
+        return row
+
+    @staticmethod
+    async def list_proxies():
+        """Every approved character with a proxy trigger, across all guilds (without fields)."""
+        async with DB.reader() as db:
+            return await _fetch_characters(
+                db,
+                "SELECT * FROM characters WHERE status='approved' AND tupper_id IS NOT NULL",
+                with_fields=False,
             )
-            await db.commit()
-            return cur.rowcount > 0
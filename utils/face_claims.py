@@ -0,0 +1,81 @@
+# utils/face_claims.py
+import unicodedata
+from typing import Optional
+
+from utils.models import Character
+
+# Form field holding the face claim
+FACE_CLAIM_KEY = "face_claim"
+# Statuses that hold a face claim; rejected characters free theirs
+ACTIVE_STATUSES = ("pending", "approved")
+
+def normalize(value: str) -> str:
+    """Compatibility-fold, case-fold and collapse whitespace: "  Zendaya  Coleman" == "zendaya coleman"."""
+    return " ".join(unicodedata.normalize("NFKC", value).casefold().split())
+
+class FaceClaimIndex:
+    """
+    Per-guild set of the face claims held by pending/approved characters, so /apply can refuse
+    a duplicate with one dict lookup instead of a query. Loaded once, then kept current from
+    DB character change events (create, approve/reject, unlink).
+    """
+
+    def __init__(self):
+        # guild_id -> normalized claim -> ids of active characters holding it
+        self._claims: dict[int, dict[str, set[int]]] = {}
+        # char_id -> (guild_id, normalized claim, active); every character that has a claim
+        self._chars: dict[int, tuple[int, str, bool]] = {}
+        # (guild_id, normalized claim) of applications being inserted right now
+        self._reserved: set[tuple[int, str]] = set()
+
+    def load(self, rows):
+        """rows: (char_id, guild_id, value, status) for every character with a face claim."""
+        self._claims.clear()
+        self._chars.clear()
+        for row in rows:
+            self._set(row["char_id"], row["guild_id"], normalize(row["value"]), row["status"] in ACTIVE_STATUSES)
+
+    def holder(self, guild_id: int, value: str) -> Optional[int]:
+        """Id of an active character in the guild already using this face claim, if any."""
+        ids = self._claims.get(guild_id, {}).get(normalize(value))
+        return min(ids) if ids else None
+
+    def reserve(self, guild_id: int, value: str) -> bool:
+        """Hold a claim for an application that is being inserted; False if it is taken or in flight."""
+        key = (guild_id, normalize(value))
+        if key in self._reserved or self.holder(guild_id, value) is not None:
+            return False
+        self._reserved.add(key)
+        return True
+
+    def release(self, guild_id: int, value: str):
+        self._reserved.discard((guild_id, normalize(value)))
+
+    def on_character_change(self, event: str, char: Character):
+        """DB listener: claims follow the character's status and disappear on unlink."""
+        known = self._chars.get(char.id)
+        value = char.fields.get(FACE_CLAIM_KEY) if event != "deleted" else None
+        if not value:
+            if known:
+                self._set(char.id, known[0], known[1], False)
+                del self._chars[char.id]
+            return
+        self._set(char.id, char.guild_id, normalize(value), char.status in ACTIVE_STATUSES)
+
+    def _set(self, char_id: int, guild_id: int, claim: str, active: bool):
+        old = self._chars.get(char_id)
+        if old and old[2]:
+            guild = self._claims.get(old[0], {})
+            ids = guild.get(old[1])
+            if ids is not None:
+                ids.discard(char_id)
+                if not ids:
+                    del guild[old[1]]
+                    if not guild:
+                        self._claims.pop(old[0], None)
+        self._chars[char_id] = (guild_id, claim, active)
+        if active:
+            self._claims.setdefault(guild_id, {}).setdefault(claim, set()).add(char_id)
+
+# Shared index; loaded by the Characters cog
+FACE_CLAIMS = FaceClaimIndex()
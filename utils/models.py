@@ -0,0 +1,44 @@
+# utils/models.py
+from dataclasses import dataclass, field, fields as dataclass_fields
+from typing import Optional
+
+@dataclass(slots=True)
+class Character:
+    """
+    One characters row as returned by DB (built straight from the cursor by from_row), with its
+    form answers from character_fields already decoded into `fields`. `version` goes up on every
+    UPDATE, so (id, version) identifies one state of the character.
+    """
+    id: int
+    guild_id: int
+    owner_id: int
+    name: str
+    bio: Optional[str] = None
+    avatar_url: Optional[str] = None
+    tupper_name: Optional[str] = None
+    tupper_id: Optional[str] = None
+    status: str = "pending"
+    submitted_at: Optional[str] = None
+    reviewed_by: Optional[int] = None
+    decision_reason: Optional[str] = None
+    decided_at: Optional[str] = None
+    imported_at: Optional[str] = None
+    version: int = 0
+    fields: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_row(cls, cursor, row) -> "Character":
+        """sqlite3 row factory; columns that aren't attributes (e.g. extra_json) are skipped."""
+        return cls(**{d[0]: value for d, value in zip(cursor.description, row) if d[0] in _COLUMNS})
+
+    @property
+    def display_name(self) -> str:
+        """Name used on proxied posts."""
+        return self.tupper_name or self.name
+
+    @property
+    def prefix(self) -> Optional[str]:
+        """Proxy trigger as matched (lower-case), or None."""
+        return (str(self.tupper_id).strip().lower() or None) if self.tupper_id else None
+
+_COLUMNS = frozenset(f.name for f in dataclass_fields(Character)) - {"fields"}
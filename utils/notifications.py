@@ -0,0 +1,149 @@
+# utils/notifications.py
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Optional
+
+import discord
+
+from utils.db import DB
+from utils.models import Character
+
+# DMs sent at once, and the pause each sender takes after a DM (Discord rate-limits DMs to new
+# recipients on top of the normal per-route limits)
+NOTIFY_CONCURRENCY = int(os.getenv("NOTIFY_CONCURRENCY", "2"))
+NOTIFY_INTERVAL = 0.5
+# Outbox rows fetched per pass
+NOTIFY_BATCH = 50
+# Retries for transient failures (5xx, 429, network): backoff doubles from BASE up to MAX seconds
+NOTIFY_MAX_ATTEMPTS = 8
+NOTIFY_BACKOFF_BASE = 5.0
+NOTIFY_BACKOFF_MAX = 3600.0
+# Longest sleep when the outbox is empty; a new row wakes the sender earlier
+NOTIFY_IDLE = 300.0
+
+# Discord error code for "Cannot send messages to this user" (DMs closed / no shared server)
+CANNOT_DM = 50007
+
+
+def render(kind: str, payload: dict) -> str:
+    """Text of an outbox notification."""
+    if kind == "decision":
+        if payload["status"] == "approved":
+            return f"Your character **{payload['name']}** (ID {payload['char_id']}) was approved!"
+        return (f"Your character **{payload['name']}** (ID {payload['char_id']}) was rejected.\n"
+                f"Reason: {payload.get('reason') or '—'}")
+    raise ValueError(f"unknown notification kind {kind!r}")
+
+
+class NotificationSender:
+    """
+    Drains the notifications outbox in the background: DMs the user, falls back to an @mention
+    in the guild's notify channel when their DMs are closed, and retries transient failures with
+    exponential backoff. Rows are only deleted once delivered (or given up on), so nothing queued
+    is lost across restarts.
+    """
+
+    def __init__(self, bot: discord.Client):
+        self.bot = bot
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"sent": 0, "fallback": 0, "retried": 0, "dropped": 0}
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def wake(self):
+        self._wake.set()
+
+    def on_character_change(self, event: str, char: Character):
+        """DB listener: decisions queue an outbox row in the same transaction, so look for it now."""
+        if event == "updated" and char.status in ("approved", "rejected"):
+            self.wake()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        limit = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+        while True:
+            self._wake.clear()
+            try:
+                rows = await DB.due_notifications(time.time(), NOTIFY_BATCH)
+                if rows:
+                    await asyncio.gather(*(self._deliver(row, limit) for row in rows))
+                    continue
+                next_at = await DB.next_notification_at()
+            except Exception as e:
+                print("[Notify] outbox pass failed:", repr(e))
+                next_at = time.time() + NOTIFY_BACKOFF_BASE
+            delay = NOTIFY_IDLE if next_at is None else max(0.0, min(next_at - time.time(), NOTIFY_IDLE))
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _deliver(self, row, limit: asyncio.Semaphore):
+        async with limit:
+            try:
+                content = render(row["kind"], json.loads(row["payload_json"]))
+                outcome = await self._send(row["guild_id"], row["user_id"], content)
+            except (discord.HTTPException, OSError, asyncio.TimeoutError) as e:
+                if isinstance(e, discord.HTTPException) and e.status < 500 and e.status != 429:
+                    outcome = f"failed ({e.status} {e.text})"
+                else:
+                    return await self._retry(row, e)
+            except Exception as e:
+                outcome = f"failed ({e!r})"
+            if outcome in self.stats:
+                self.stats[outcome] += 1
+            else:
+                self.stats["dropped"] += 1
+                print(f"[Notify] dropped notification {row['id']} for user {row['user_id']}: {outcome}")
+            await DB.finish_notification(row["id"])
+            await asyncio.sleep(NOTIFY_INTERVAL)
+
+    async def _send(self, guild_id: int, user_id: int, content: str) -> str:
+        """Deliver one message; returns "sent", "fallback" or why it can't be delivered."""
+        user = self.bot.get_user(user_id)
+        if user is None:
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except discord.NotFound:
+                return "unknown user"
+        try:
+            await user.send(content)
+            return "sent"
+        except discord.Forbidden as e:
+            if e.code != CANNOT_DM:
+                raise
+        # DMs closed: mention them in the guild's notify channel instead
+        settings = await DB.get_settings(guild_id) or {}
+        guild = self.bot.get_guild(guild_id)
+        channel = guild.get_channel(settings["notify_channel_id"]) if guild and settings.get("notify_channel_id") else None
+        if channel is None:
+            return "DMs closed and no notify channel"
+        await channel.send(f"<@{user_id}> {content}", allowed_mentions=discord.AllowedMentions(users=True))
+        return "fallback"
+
+    async def _retry(self, row, error: BaseException):
+        attempts = row["attempts"] + 1
+        if attempts >= NOTIFY_MAX_ATTEMPTS:
+            self.stats["dropped"] += 1
+            print(f"[Notify] giving up on notification {row['id']} after {attempts} attempts: {error!r}")
+            return await DB.finish_notification(row["id"])
+        self.stats["retried"] += 1
+        retry_after = getattr(error, "retry_after", None)
+        delay = min(NOTIFY_BACKOFF_BASE * 2 ** row["attempts"], NOTIFY_BACKOFF_MAX)
+        delay = max(delay * random.uniform(0.8, 1.2), retry_after or 0)
+        await DB.retry_notification(row["id"], time.time() + delay)
@@ -0,0 +1,96 @@
+# utils/paginator.py
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+import discord
+from discord import ui
+
+# Discord's limit for a message's content
+MESSAGE_MAX = 2000
+
+def clip(text: str, n: int) -> str:
+    """`text` cut to at most n characters, with an ellipsis when it was longer."""
+    return text if len(text) <= n else text[:n - 1] + "…"
+
+class KeysetPager(ui.View):
+    """
+    Prev/Next buttons over a keyset-paginated DB query.
+      fetch(cursor, limit) -> rows    (cursor is None for the first page)
+      cursor_of(row)       -> cursor  (key of the last row on a page)
+      render(rows, page)   -> str     (clipped to MESSAGE_MAX, so a long page can't break the message)
+    Pages already seen are kept so Prev costs nothing, and the page after the current one
+    is prefetched in the background so Next is usually instant.
+    """
+
+    def __init__(self, user_id: int, fetch: Callable[[Any, int], Awaitable[list]],
+                 cursor_of: Callable[[Any], Any], render: Callable[[list, int], str],
+                 page_size: int = 10, timeout: float = 300):
+        super().__init__(timeout=timeout)
+        self.user_id = user_id
+        self.fetch = fetch
+        self.cursor_of = cursor_of
+        self.render = render
+        self.page_size = page_size
+        self.pages: list[list] = []
+        self.more: list[bool] = []          # more[i]: a page exists after pages[i]
+        self.index = 0
+        self._prefetch: Optional[asyncio.Task] = None
+
+    async def _load(self, cursor) -> tuple[list, bool]:
+        rows = list(await self.fetch(cursor, self.page_size + 1))
+        return rows[:self.page_size], len(rows) > self.page_size
+
+    def _start_prefetch(self):
+        i = self.index
+        if self.more[i] and i + 1 >= len(self.pages) and self._prefetch is None:
+            self._prefetch = asyncio.create_task(self._load(self.cursor_of(self.pages[i][-1])))
+
+    def _content(self, index: int) -> str:
+        return clip(self.render(self.pages[index], index), MESSAGE_MAX)
+
+    def _sync_buttons(self):
+        self.prev_page.disabled = self.index == 0
+        self.next_page.disabled = not self.more[self.index]
+
+    async def start(self, interaction: discord.Interaction, empty: str):
+        """Send the first page as an ephemeral reply (without buttons if it is the only page)."""
+        rows, more = await self._load(None)
+        if not rows:
+            return await interaction.response.send_message(empty, ephemeral=True)
+        self.pages.append(rows)
+        self.more.append(more)
+        if not more:
+            return await interaction.response.send_message(self._content(0), ephemeral=True)
+        self._sync_buttons()
+        self._start_prefetch()
+        await interaction.response.send_message(self._content(0), view=self, ephemeral=True)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.user_id
+
+    async def on_timeout(self):
+        if self._prefetch:
+            self._prefetch.cancel()
+
+    async def _show(self, interaction: discord.Interaction):
+        self._sync_buttons()
+        self._start_prefetch()
+        await interaction.response.edit_message(content=self._content(self.index), view=self)
+
+    @ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary)
+    async def prev_page(self, interaction: discord.Interaction, button: ui.Button):
+        self.index = max(0, self.index - 1)
+        await self._show(interaction)
+
+    @ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: ui.Button):
+        if self.index + 1 >= len(self.pages):
+            task, self._prefetch = self._prefetch, None
+            rows, more = await task if task else await self._load(self.cursor_of(self.pages[self.index][-1]))
+            if not rows:
+                self.more[self.index] = False
+                return await self._show(interaction)
+            self.pages.append(rows)
+            self.more.append(more)
+        self.index += 1
+        await self._show(interaction)
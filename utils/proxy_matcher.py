@@ -0,0 +1,81 @@
+# utils/proxy_matcher.py
+from typing import Optional
+
+from utils.models import Character
+
+_END = ""  # trie key holding the character entry for a complete prefix (never a real 1-char key)
+
+class ProxyMatcher:
+    """
+    Per-guild, per-owner tries of proxy prefixes (characters.tupper_id), e.g. "jo:".
+    match() walks at most len(prefix) characters of a message and never touches the DB,
+    so messages from users without proxies cost two dict lookups.
+    """
+
+    def __init__(self):
+        # guild_id -> owner_id -> trie root
+        self._tries: dict[int, dict[int, dict]] = {}
+        # (guild_id, owner_id) -> char_id -> character; the source a trie is rebuilt from
+        self._entries: dict[tuple[int, int], dict[int, Character]] = {}
+
+    def load(self, chars: list[Character]):
+        self._tries.clear()
+        self._entries.clear()
+        for char in chars:
+            if not char.prefix:
+                continue  # blank trigger (older rows); nothing to match
+            self._entries.setdefault((char.guild_id, char.owner_id), {})[char.id] = char
+        for guild_id, owner_id in self._entries:
+            self._rebuild(guild_id, owner_id)
+
+    def match(self, guild_id: int, owner_id: int, content: str) -> Optional[tuple[Character, str]]:
+        """Longest prefix of `content` that is one of the owner's triggers -> (character, remaining text)."""
+        owners = self._tries.get(guild_id)
+        node = owners.get(owner_id) if owners else None
+        if node is None:
+            return None
+        best, best_len = None, 0
+        for i, ch in enumerate(content):
+            node = node.get(ch.lower())
+            if node is None:
+                break
+            if _END in node:
+                best, best_len = node[_END], i + 1
+        if best is None:
+            return None
+        return best, content[best_len:].lstrip()
+
+    def owner_prefixes(self, guild_id: int, owner_id: int) -> dict[str, int]:
+        """prefix -> char_id for one owner (used to refuse duplicate triggers)."""
+        return {c.prefix: cid for cid, c in self._entries.get((guild_id, owner_id), {}).items()}
+
+    def on_character_change(self, event: str, char: Character):
+        """DB listener: keep the owner's trie in step with approvals, proxy edits and unlinks."""
+        key = (char.guild_id, char.owner_id)
+        entries = self._entries.setdefault(key, {})
+        active = event != "deleted" and char.status == "approved" and char.prefix
+        if active:
+            entries[char.id] = char
+        elif entries.pop(char.id, None) is None:
+            return
+        self._rebuild(*key)
+
+    def _rebuild(self, guild_id: int, owner_id: int):
+        entries = self._entries.get((guild_id, owner_id))
+        owners = self._tries.setdefault(guild_id, {})
+        if not entries:
+            self._entries.pop((guild_id, owner_id), None)
+            owners.pop(owner_id, None)
+            if not owners:
+                self._tries.pop(guild_id, None)
+            return
+        root: dict = {}
+        for char in entries.values():
+            node = root
+            for ch in char.prefix:
+                node = node.setdefault(ch, {})
+            node[_END] = char
+        owners[owner_id] = root
+
+# Shared matcher; loaded by the Proxy cog
+PROXIES = ProxyMatcher()
@@ -0,0 +1,186 @@
+# utils/query_plans.py
+"""
+Query-plan regression check for utils/db.py.
+
+Runs every public DB coroutine (and async iterator) against a seeded temporary database, records each SQL
+statement it executes, and fails if EXPLAIN QUERY PLAN shows a full scan or a temp
+B-tree sort for any of them. Add a sample call to sample_calls() for every new DB method.
+
+    python -m utils.query_plans
+"""
+import asyncio
+import inspect
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from utils import db as dbmod
+from utils.db import DB
+
+# Not queries
+SKIP = {"init", "close"}
+# Bulk loads that read a whole table on purpose
+FULL_SCAN_OK = {"warm_caches", "load_webhooks", "load_field_values"}
+# Statements that have no plan worth checking ("-- TRIGGER name" is how the trace reports trigger bodies)
+IGNORED_SQL = re.compile(r"^\s*(PRAGMA|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|CREATE|DROP|ALTER|ANALYZE)\b|^\s*--", re.I)
+
+# FTS5's own reads/writes of its shadow tables (e.g. 'main'.'characters_fts_config')
+FTS_SHADOW_SQL = re.compile(r"'main'\.'\w+_(?:config|data|idx|docsize|content)'")
+
+SEED_GUILDS = 3
+SEED_OWNERS = 10
+SEED_CHARACTERS = 600
+
+
+async def seed():
+    for g in range(1, SEED_GUILDS + 1):
+        await DB.set_review_channel(g, 100 + g)
+        await DB.set_form(g, dbmod.DEFAULT_FORM)
+    chars = await asyncio.gather(*(
+        DB.create_character(1 + i % SEED_GUILDS, 1 + i % SEED_OWNERS, f"Character {i}",
+                            {"age": str(18 + i % 40), "occupation": f"Job {i % 25}"})
+        for i in range(SEED_CHARACTERS)
+    ))
+    for i, c in enumerate(chars):
+        if i % 3 == 0:
+            await DB.save_review_message(c.guild_id, 100 + c.guild_id, 10_000 + c.id, c.id)
+        elif i % 3 == 1:
+            await DB.decide(c.guild_id, c.id, "approved", 999, None)
+            if i % 2:
+                await DB.set_proxy(c.guild_id, c.owner_id, c.id, f"c{i}:")
+    await DB.set_webhook(101, "https://discord.com/api/webhooks/1/token")
+
+
+def sample_calls(g: int, owner: int, char_id: int) -> dict:
+    """One representative call per public DB coroutine."""
+    def uncached(fn):
+        async def call():
+            dbmod._caches_warm = False
+            dbmod._settings_cache.clear()
+            dbmod._form_cache.clear()
+            return await fn()
+        return call
+
+    async def drain(batches):
+        async for _ in batches:
+            pass
+
+    return {
+        "warm_caches": DB.warm_caches,
+        "get_meta": lambda: DB.get_meta("command_tree_hash"),
+        "set_meta": lambda: DB.set_meta("command_tree_hash", "x"),
+        "load_webhooks": DB.load_webhooks,
+        "set_webhook": lambda: DB.set_webhook(102, "https://discord.com/api/webhooks/2/token"),
+        "import_webhooks": lambda: DB.import_webhooks({103: "https://discord.com/api/webhooks/3/token"}),
+        "get_settings": uncached(lambda: DB.get_settings(g)),
+        "set_review_channel": lambda: DB.set_review_channel(g, 200),
+        "set_reviewer_role": lambda: DB.set_reviewer_role(g, 300),
+        "set_notify_channel": lambda: DB.set_notify_channel(g, 400),
+        "due_notifications": lambda: DB.due_notifications(4e9),
+        "next_notification_at": DB.next_notification_at,
+        "finish_notification": lambda: DB.finish_notification(1),
+        "retry_notification": lambda: DB.retry_notification(2, 0.0),
+        "get_form": uncached(lambda: DB.get_form(g)),
+        "set_form": lambda: DB.set_form(g, dbmod.DEFAULT_FORM),
+        "save_review_message": lambda: DB.save_review_message(g, 100 + g, 1, char_id),
+        "delete_review_message": lambda: DB.delete_review_message(g, 1),
+        "delete_review_messages": lambda: DB.delete_review_messages(g, [1, 2]),
+        "list_pending_review_messages": lambda: DB.list_pending_review_messages(g),
+        "list_review_messages": lambda: DB.list_review_messages(g),
+        "list_unposted_pending": lambda: DB.list_unposted_pending(g),
+        "create_character": lambda: DB.create_character(g, owner, "New", {"age": "30"}),
+        "get_character": lambda: DB.get_character(g, char_id),
+        "find_by_field": lambda: DB.find_by_field(g, "occupation", "job 3", limit=10, after_id=1),
+        "search_characters": lambda: DB.search_characters(g, "charact job", status="approved", owner_id=owner),
+        "load_field_values": lambda: DB.load_field_values("face_claim"),
+        "list_guild_characters": lambda: DB.list_guild_characters(g),
+        "get_guild_stats": lambda: DB.get_guild_stats(g),
+        "iter_guild_characters": lambda: drain(DB.iter_guild_characters(g, batch=100)),
+        "import_characters": lambda: DB.import_characters(g, [
+            {"owner_id": owner, "name": "Imported", "bio": None, "avatar_url": None, "tupper_name": None,
+             "tupper_id": None, "status": "approved", "submitted_at": "2020-01-01 00:00:00", "reviewed_by": 999,
+             "decision_reason": None, "decided_at": "2020-01-02 00:00:00", "fields": {"age": "40"}},
+        ]),
+        "list_my_characters": lambda: DB.list_my_characters(g, owner, before_id=char_id, limit=10),
+        "list_pending": lambda: DB.list_pending(g, 10, after=("2000-01-01", 0)),
+        "set_status": lambda: DB.set_status(g, char_id, "pending", 999, None),
+        "decide": lambda: DB.decide(g, char_id, "rejected", 999, "no", None),
+        "decide_many": lambda: DB.decide_many(g, "approved", 999, None, owner_id=owner, submitted_before="2999-01-01", limit=5),
+        "set_proxy": lambda: DB.set_proxy(g, owner, char_id, "zz:"),
+        "list_proxies": DB.list_proxies,
+        "unlink": lambda: DB.unlink(g, owner, char_id),
+    }
+
+
+def problems(conn: sqlite3.Connection, sql: str, allow_scan: bool) -> list[str]:
+    partial = {row[1] for table in ("characters", "review_messages")
+               for row in conn.execute(f"PRAGMA index_list({table})") if row[4]}
+    found = []
+    for _, _, _, detail in conn.execute("EXPLAIN QUERY PLAN " + sql):
+        if "TEMP B-TREE" in detail:
+            found.append(detail)
+        elif (detail.startswith("SCAN ") and not allow_scan and "VIRTUAL TABLE" not in detail
+              and detail != "SCAN CONSTANT ROW"):  # SELECT without a table, e.g. last_insert_rowid()
+            m = re.search(r"USING (?:COVERING )?INDEX (\w+)", detail)
+            if not (m and m.group(1) in partial):
+                found.append(detail)
+    return found
+
+
+async def run(path: str) -> int:
+    dbmod.DB_PATH = path
+    await DB.init()
+    try:
+        await seed()
+        g, owner = 1, 1
+        mine = await DB.list_my_characters(g, owner, limit=1)
+        calls = sample_calls(g, owner, mine[0]["id"])
+
+        public = {name for name, fn in vars(DB).items()
+                  if isinstance(fn, staticmethod)
+                  and (inspect.iscoroutinefunction(fn.__func__) or inspect.isasyncgenfunction(fn.__func__))
+                  and not name.startswith("_") and name not in SKIP}
+        missing = sorted(public - calls.keys())
+
+        pool = dbmod._pool
+        current = {"name": None}
+        seen: list[tuple[str, str]] = []
+
+        def trace(sql: str):
+            if current["name"] and not IGNORED_SQL.match(sql) and not FTS_SHADOW_SQL.search(sql):
+                seen.append((current["name"], sql))
+
+        for conn in [pool.writer, *pool.readers]:
+            await conn.set_trace_callback(trace)
+        for name, call in calls.items():
+            current["name"] = name
+            await call()
+        current["name"] = None
+    finally:
+        await DB.close()
+
+    failures = [f"DB.{name}: no sample call in utils/query_plans.py" for name in missing]
+    checked = set()
+    with sqlite3.connect(path) as conn:
+        for name, sql in seen:
+            if (name, sql) in checked:
+                continue
+            checked.add((name, sql))
+            for detail in problems(conn, sql, name in FULL_SCAN_OK):
+                failures.append(f"DB.{name}: {detail}\n    {' '.join(sql.split())}")
+
+    print(f"Checked {len(checked)} statements from {len(calls)} DB methods.")
+    for f in failures:
+        print("FAIL", f)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        return asyncio.run(run(os.path.join(tmp, "plans.db")))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
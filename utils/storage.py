@@ -1,24 +1,119 @@
-import json, os, threading
-
-class JsonStore:
-    def __init__(self, path="webhooks.json"):
-        self.path = path
-        self.lock = threading.Lock()
-        if not os.path.exists(self.path):
-            with open(self.path, "w", encoding="utf-8") as f: f.write("{}")
-
-    def read(self) -> dict:
-        with self.lock, open(self.path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def write(self, data: dict):
-        with self.lock, open(self.path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-
-    def get(self, key, default=None):
-        return self.read().get(key, default)
-
-    def set(self, key, value):
-        data = self.read()
-        data[key] = value
-        self.write(data)
+import asyncio, json, os, time
+from typing import Optional
+
+import aiohttp
+import discord
+
+from utils.db import DB
+
+# Name given to webhooks the bot creates for character posting
+PROXY_WEBHOOK_NAME = "Character Proxy"
+# Seconds a channel where the bot lacks Manage Webhooks is skipped before ensure() asks Discord again
+# (permission and channel updates clear it sooner)
+WEBHOOK_DENIED_TTL = 300.0
+
+class WebhooksDenied(Exception):
+    """The bot can't list/create webhooks in the channel (missing Manage Webhooks)."""
+
+def _read_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+class WebhookRegistry:
+    """Channel id -> webhook URL. Lookups are dict hits; writes go to the channel_webhooks table."""
+
+    def __init__(self, legacy_path="webhooks.json"):
+        self.legacy_path = legacy_path
+        self._urls: dict[int, str] = {}
+        # Parsed discord.Webhook per channel, dropped whenever the channel's URL changes
+        self._webhooks: dict[int, discord.Webhook] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        # channel_id -> monotonic time until which ensure() fails fast with WebhooksDenied
+        self._denied: dict[int, float] = {}
+
+    async def load(self):
+        """Load every saved webhook, importing the old webhooks.json once if it is still around."""
+        self._urls = await DB.load_webhooks()
+        self._webhooks.clear()
+        if os.path.exists(self.legacy_path):
+            data = await asyncio.to_thread(_read_json, self.legacy_path)
+            legacy = {int(k): v for k, v in data.items() if v}
+            if legacy:
+                await DB.import_webhooks(legacy)
+                self._urls = {**legacy, **self._urls}
+            # Rename rather than delete so the file stays around as a backup
+            await asyncio.to_thread(os.replace, self.legacy_path, self.legacy_path + ".imported")
+            print(f"[webhooks] Imported {len(legacy)} webhooks from {self.legacy_path}")
+
+    def get(self, channel_id: int) -> Optional[str]:
+        return self._urls.get(int(channel_id))
+
+    def webhook(self, channel_id: int, session: aiohttp.ClientSession) -> Optional[discord.Webhook]:
+        """Cached discord.Webhook for the channel, bound to the bot's shared session."""
+        wh = self._webhooks.get(int(channel_id))
+        if wh is None:
+            url = self.get(channel_id)
+            if not url:
+                return None
+            wh = self._webhooks[int(channel_id)] = discord.Webhook.from_url(url, session=session)
+        return wh
+
+    async def set(self, channel_id: int, url: Optional[str]):
+        await DB.set_webhook(int(channel_id), url)
+        self._webhooks.pop(int(channel_id), None)
+        if url is None:
+            self._urls.pop(int(channel_id), None)
+        else:
+            self._urls[int(channel_id)] = url
+
+    async def ensure(self, channel) -> str:
+        """
+        Webhook URL for a text/forum channel (not a thread), provisioning one on first use:
+        reuse a webhook this bot already owns in the channel, otherwise create one.
+        Only cache misses make REST calls. Raises WebhooksDenied without a request while a recent
+        403 for the channel is remembered (see allow()).
+        """
+        url = self.get(channel.id)
+        if url:
+            return url
+        if self.denied(channel.id):
+            raise WebhooksDenied(channel.id)
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:
+            url = self.get(channel.id)
+            if url:
+                return url
+            if self.denied(channel.id):
+                raise WebhooksDenied(channel.id)
+            me = channel.guild.me
+            try:
+                owned = [wh for wh in await channel.webhooks() if wh.user and wh.user.id == me.id and wh.token]
+                wh = owned[0] if owned else await channel.create_webhook(name=PROXY_WEBHOOK_NAME, reason="Character posting")
+            except discord.Forbidden as e:
+                self._denied[channel.id] = time.monotonic() + WEBHOOK_DENIED_TTL
+                raise WebhooksDenied(channel.id) from e
+            await self.set(channel.id, wh.url)
+            return wh.url
+
+    def denied(self, channel_id: int) -> bool:
+        """True while a missing-permission result for the channel is cached."""
+        until = self._denied.get(int(channel_id))
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._denied[int(channel_id)]
+            return False
+        return True
+
+    def allow(self, *channel_ids: int):
+        """Forget cached permission failures, e.g. after the channel's or the bot's roles changed."""
+        for cid in channel_ids:
+            self._denied.pop(int(cid), None)
+
+    async def forget(self, channel_id: int, url: str):
+        """Drop a webhook that Discord reported as deleted (unless it was already replaced)."""
+        if self.get(channel_id) == url:
+            await self.set(channel_id, None)
+
+# Shared by every cog; loaded in setup_hook
+WEBHOOKS = WebhookRegistry()
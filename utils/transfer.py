@@ -0,0 +1,155 @@
+# utils/transfer.py
+import codecs
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+from typing import BinaryIO, Iterator, Optional
+
+from utils.db import IMPORT_COLUMNS
+from utils.models import Character
+
+# Bumped if the record layout changes incompatibly
+EXPORT_VERSION = 1
+EXPORT_FORMATS = ("ndjson", "csv")
+# CSV has one row per character: the export columns plus the form answers as a JSON object
+CSV_COLUMNS = ("id", *IMPORT_COLUMNS, "fields")
+STATUSES = ("pending", "approved", "rejected")
+# Settings an import may restore (only into the guild they were exported from)
+SETTINGS_KEYS = ("review_channel_id", "reviewer_role_id", "notify_channel_id")
+MAX_FORM_FIELDS = 5
+
+# Exports
+# NDJSON: one JSON object per line with a "type": an "export" header, then "settings" and
+# "form" for the guild, then one "character" per character. CSV only carries the characters.
+# Both are gzip-compressed and written batch by batch, so nothing holds the whole guild.
+
+def character_record(char: Character) -> dict:
+    return {"id": char.id, **{col: getattr(char, col) for col in IMPORT_COLUMNS}, "fields": char.fields}
+
+class ExportWriter:
+    """Streams an export into a binary file object (gzip-compressed)."""
+
+    def __init__(self, fp: BinaryIO, fmt: str):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"unknown export format {fmt!r}")
+        self.fmt = fmt
+        self.count = 0
+        self._gz = gzip.GzipFile(fileobj=fp, mode="wb")
+        self._out = io.TextIOWrapper(self._gz, encoding="utf-8", newline="")
+        self._csv = csv.DictWriter(self._out, CSV_COLUMNS) if fmt == "csv" else None
+
+    def header(self, guild_id: int, settings: Optional[dict], form: list[dict]):
+        if self._csv:
+            self._csv.writeheader()
+            return
+        self._line({"type": "export", "version": EXPORT_VERSION, "guild_id": guild_id,
+                    "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds")})
+        self._line({"type": "settings", **{k: (settings or {}).get(k) for k in SETTINGS_KEYS}})
+        self._line({"type": "form", "fields": form})
+
+    def characters(self, chars: list[Character]):
+        for char in chars:
+            record = character_record(char)
+            if self._csv:
+                record["fields"] = json.dumps(record["fields"], ensure_ascii=False)
+                self._csv.writerow(record)
+            else:
+                self._line({"type": "character", **record})
+        self.count += len(chars)
+
+    def close(self):
+        # Flush the text layer and end the gzip stream, leaving the underlying file open
+        self._out.flush()
+        self._out.detach()
+        self._gz.close()
+
+    def _line(self, record: dict):
+        self._out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self._out.write("\n")
+
+# Imports
+
+def read_records(fp: BinaryIO) -> Iterator[tuple[str, Optional[dict]]]:
+    """
+    (type, data) for each record of an export file, gzip-compressed or not, NDJSON or CSV (told
+    apart by the first byte). Read lazily, one line at a time. Lines that can't be decoded come
+    out as ("invalid", None) so the caller can count them and carry on.
+    """
+    head = fp.read(2)
+    fp.seek(0)
+    raw = gzip.GzipFile(fileobj=fp, mode="rb") if head == b"\x1f\x8b" else fp
+    ndjson = raw.peek(4).removeprefix(codecs.BOM_UTF8)[:1] == b"{"
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+
+    if ndjson:
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield "invalid", None
+                continue
+            if isinstance(record, dict) and isinstance(record.get("type"), str):
+                yield record.pop("type"), record
+            else:
+                yield "invalid", None
+        return
+
+    for row in csv.DictReader(text):
+        try:
+            row["fields"] = json.loads(row.get("fields") or "{}")
+        except ValueError:
+            yield "invalid", None
+            continue
+        yield "character", {k: (v if v != "" else None) for k, v in row.items() if k is not None}
+
+def parse_character(data: dict) -> dict:
+    """Validate an exported character for DB.import_characters; raises ValueError if it can't be used."""
+    def opt_int(value):
+        return int(value) if value not in (None, "") else None
+
+    def opt_str(value):
+        return str(value) if value not in (None, "") else None
+
+    name = opt_str(data.get("name"))
+    if not name:
+        raise ValueError("character without a name")
+    status = data.get("status") or "pending"
+    if status not in STATUSES:
+        raise ValueError(f"unknown status {status!r}")
+    fields = data.get("fields") or {}
+    if not isinstance(fields, dict):
+        raise ValueError("fields must be an object")
+    owner_id = opt_int(data.get("owner_id"))
+    if owner_id is None:
+        raise ValueError("character without an owner")
+    return {
+        "owner_id": owner_id,
+        "name": name,
+        "bio": opt_str(data.get("bio")),
+        "avatar_url": opt_str(data.get("avatar_url")),
+        "tupper_name": opt_str(data.get("tupper_name")),
+        "tupper_id": opt_str(data.get("tupper_id")),
+        "status": status,
+        "submitted_at": opt_str(data.get("submitted_at")),
+        "reviewed_by": opt_int(data.get("reviewed_by")),
+        "decision_reason": opt_str(data.get("decision_reason")),
+        "decided_at": opt_str(data.get("decided_at")) if status != "pending" else None,
+        "fields": {str(k): str(v) for k, v in fields.items() if v not in (None, "")},
+    }
+
+def parse_form(data: dict) -> list[dict]:
+    """Validate an exported form (the same shape /config_form_add builds); raises ValueError."""
+    form = data.get("fields")
+    if not isinstance(form, list) or not 0 < len(form) <= MAX_FORM_FIELDS:
+        raise ValueError("form must have 1-5 fields")
+    keys = set()
+    for f in form:
+        key = f.get("key") if isinstance(f, dict) else None
+        if not isinstance(key, str) or not key.replace("_", "").isalnum() or key in keys or not f.get("label"):
+            raise ValueError(f"bad form field {f!r}")
+        keys.add(key)
+    return form
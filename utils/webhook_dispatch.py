@@ -0,0 +1,219 @@
+# utils/webhook_dispatch.py
+import asyncio
+import json
+import re
+import time
+from collections import defaultdict
+from typing import Optional
+
+import aiohttp
+import discord
+
+API_BASE = "https://discord.com/api/v10"
+WEBHOOK_URL_RE = re.compile(r"discord(?:app)?\.com/api/(?:v\d+/)?webhooks/(?P<id>[0-9]+)/(?P<token>[A-Za-z0-9._-]+)")
+
+# Posts waiting per webhook before new ones are refused
+QUEUE_MAX = 50
+# A bucket's worker exits after this many idle seconds (it is recreated on the next post)
+IDLE_SECONDS = 60.0
+# Retries for 429s and 5xx responses before giving up on a post
+MAX_RETRIES = 5
+
+
+class WebhookError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Webhook request failed ({status}): {message}")
+        self.status = status
+
+
+class WebhookNotFound(WebhookError):
+    """The webhook was deleted; callers should forget/re-create it."""
+
+
+class QueueFull(Exception):
+    pass
+
+
+class _ChannelStats:
+    __slots__ = ("depth", "sent", "failed", "rate_limited", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.depth = 0
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class _Bucket:
+    """One worker per webhook: posts go out in FIFO order and the worker paces itself
+    from the X-RateLimit-* headers of the previous response."""
+
+    def __init__(self, dispatcher: "WebhookDispatcher", key: str):
+        self.dispatcher = dispatcher
+        self.key = key
+        self.queue: asyncio.Queue = asyncio.Queue(QUEUE_MAX)
+        self.remaining = 1
+        self.reset_at = 0.0
+        self.busy = False
+        self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                job = await asyncio.wait_for(self.queue.get(), IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                if self.queue.empty():
+                    self.dispatcher._buckets.pop(self.key, None)
+                    return
+                continue
+            self.busy = True
+            try:
+                await self._process(job)
+            finally:
+                self.busy = False
+
+    async def _process(self, job):
+        url, params, payload, files, channel_id, enqueued, fut = job
+        stats = self.dispatcher._stats[channel_id]
+        try:
+            result = await self._post(url, params, payload, files, stats)
+        except Exception as e:
+            stats.failed += 1
+            if not fut.done():
+                fut.set_exception(e)
+        else:
+            stats.sent += 1
+            if not fut.done():
+                fut.set_result(result)
+        finally:
+            stats.depth -= 1
+            waited = time.monotonic() - enqueued
+            stats.wait_total += waited
+            stats.wait_max = max(stats.wait_max, waited)
+
+    async def _post(self, url: str, params: dict, payload: dict, files: list[discord.File], stats: _ChannelStats):
+        for attempt in range(MAX_RETRIES + 1):
+            delay = self.reset_at - time.monotonic()
+            if self.remaining <= 0 and delay > 0:
+                await asyncio.sleep(delay)
+
+            async with self.dispatcher.session.post(url, params=params, **_body(payload, files)) as resp:
+                headers = resp.headers
+                if "X-RateLimit-Remaining" in headers:
+                    self.remaining = int(headers["X-RateLimit-Remaining"])
+                    self.reset_at = time.monotonic() + float(headers.get("X-RateLimit-Reset-After", 0))
+
+                if resp.status == 429:
+                    stats.rate_limited += 1
+                    data = await resp.json(content_type=None)
+                    retry_after = float(data.get("retry_after", headers.get("Retry-After", 1)))
+                    self.remaining = 0
+                    self.reset_at = time.monotonic() + retry_after
+                    continue
+                if resp.status >= 500:
+                    await asyncio.sleep(min(2 ** attempt, 30))
+                    continue
+                if resp.status == 404:
+                    raise WebhookNotFound(404, await resp.text())
+                if resp.status >= 400:
+                    raise WebhookError(resp.status, await resp.text())
+                return await resp.json() if resp.status == 200 else None
+        raise WebhookError(429, "gave up after repeated rate limits/server errors")
+
+
+def _body(payload: dict, files: list[discord.File]) -> dict:
+    """Request body: plain JSON, or multipart (payload_json + files[n]) when there are files.
+    Built per attempt, since a retry has to send the files again from the start."""
+    if not files:
+        return {"json": payload}
+    form = aiohttp.FormData()
+    form.add_field("payload_json", json.dumps(
+        {**payload, "attachments": [{"id": i, "filename": f.filename} for i, f in enumerate(files)]}
+    ), content_type="application/json")
+    for i, f in enumerate(files):
+        f.reset(seek=True)
+        form.add_field(f"files[{i}]", f.fp, filename=f.filename, content_type="application/octet-stream")
+    return {"data": form}
+
+
+class WebhookDispatcher:
+    """Queues webhook posts per webhook bucket instead of sending them inline."""
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+        self._buckets: dict[str, _Bucket] = {}
+        self._stats: defaultdict[int, _ChannelStats] = defaultdict(_ChannelStats)
+
+    def submit(
+        self,
+        webhook_url: str,
+        channel_id: int,
+        *,
+        content: Optional[str] = None,
+        username: Optional[str] = None,
+        avatar_url: Optional[str] = None,
+        embeds: Optional[list[discord.Embed]] = None,
+        thread_id: Optional[int] = None,
+        files: Optional[list[discord.File]] = None,
+        wait: bool = False,
+    ) -> tuple[asyncio.Future, int]:
+        """
+        Queue a post and return (future, ahead): the future resolves with the message payload
+        (only when wait=True, otherwise None) and `ahead` is how many posts are in front of it.
+        `files` are uploaded with the post (multipart); the caller closes them once the future is done.
+        Raises QueueFull when the webhook's queue is at QUEUE_MAX.
+        """
+        m = WEBHOOK_URL_RE.search(webhook_url)
+        if not m:
+            raise WebhookError(0, "not a Discord webhook URL")
+        bucket = self._buckets.get(m["id"])
+        if bucket is None:
+            bucket = self._buckets[m["id"]] = _Bucket(self, m["id"])
+        if bucket.queue.full():
+            raise QueueFull(f"{bucket.queue.qsize()} posts are already waiting for this channel.")
+
+        payload: dict = {"allowed_mentions": {"parse": []}}
+        if content:
+            payload["content"] = content
+        if username:
+            payload["username"] = username[:80]
+        if avatar_url:
+            payload["avatar_url"] = avatar_url
+        if embeds:
+            payload["embeds"] = [e.to_dict() for e in embeds]
+        params = {"wait": "true" if wait else "false"}
+        if thread_id:
+            params["thread_id"] = str(thread_id)
+
+        ahead = bucket.queue.qsize() + (1 if bucket.busy else 0)
+        fut = asyncio.get_running_loop().create_future()
+        url = f"{API_BASE}/webhooks/{m['id']}/{m['token']}"
+        bucket.queue.put_nowait((url, params, payload, list(files or ()), channel_id, time.monotonic(), fut))
+        self._stats[channel_id].depth += 1
+        return fut, ahead
+
+    def stats(self, channel_id: Optional[int] = None) -> dict[int, dict]:
+        """Per-channel queue depth, wait times (ms) and counters."""
+        items = [(channel_id, self._stats[channel_id])] if channel_id is not None else self._stats.items()
+        out = {}
+        for cid, st in items:
+            done = st.sent + st.failed
+            out[cid] = {
+                "depth": st.depth,
+                "sent": st.sent,
+                "failed": st.failed,
+                "rate_limited": st.rate_limited,
+                "avg_wait_ms": st.wait_total * 1000 / done if done else 0.0,
+                "max_wait_ms": st.wait_max * 1000,
+            }
+        return out
+
+    async def close(self):
+        for bucket in list(self._buckets.values()):
+            bucket.task.cancel()
+            while not bucket.queue.empty():
+                *_, fut = bucket.queue.get_nowait()
+                fut.cancel()
+        self._buckets.clear()